@@ -1,9 +1,23 @@
 import os
+from pathlib import Path
+
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# Repository root (src/moxie/config.py -> ../..); relative file paths below are
+# resolved against it so they don't depend on the process's working directory
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+
+def _project_path(value: str) -> str:
+    """Resolve a relative path against PROJECT_ROOT; "" stays "" (feature disabled)."""
+    return str(PROJECT_ROOT / value) if value else ""
+
+
 DATABASE_URL: str = os.environ.get("DATABASE_URL", "sqlite:///./moxie.db")
 GOOGLE_SHEETS_ID: str = os.environ.get("GOOGLE_SHEETS_ID", "")
 GOOGLE_SHEETS_KEY_PATH: str = os.environ.get("GOOGLE_SHEETS_KEY_PATH", "")
 GOOGLE_SHEETS_TAB_NAME: str = os.environ.get("GOOGLE_SHEETS_TAB_NAME", "Buildings")
+# Tier 3 LLM scraper's SQLite cache (extractions + availability links)
+LLM_CACHE_PATH: str = _project_path(os.environ.get("LLM_CACHE_PATH", "llm_cache.db"))
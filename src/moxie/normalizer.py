@@ -1,15 +1,18 @@
 """
 Unit normalizer — pure function that converts raw scraper output to a DB-ready dict.
 
-Every scraper calls normalize(raw, building_id) before writing to the database.
+Every scraper's units go through normalize(raw, building_id) -- or
+normalize_batch() for a whole scrape -- before being written to the database.
 This module never touches the database.
 """
 
-from datetime import datetime, timezone
+import functools
+import re
+from datetime import date, datetime, timezone
 from typing import Any, Optional
 
 from dateutil import parser as dateutil_parser
-from pydantic import BaseModel, field_validator
+from pydantic import BaseModel, ValidationError, field_validator
 
 # ---------------------------------------------------------------------------
 # Canonical bed type definitions
@@ -82,6 +85,27 @@ BED_TYPE_ALIASES: dict[str, str] = {
 }
 
 
+# Date shapes most scrapers emit, parsed without dateutil's format probing.
+# Anything else (month names, two-digit years, times) falls back to dateutil.
+_ISO_DATE_RE = re.compile(r"\d{4}-\d{2}-\d{2}")
+_US_DATE_RE = re.compile(r"(\d{1,2})/(\d{1,2})/(\d{4})")
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_date_fallback(date_part: str, today: date) -> str:
+    """Parse a free-form date with dateutil, memoized per string and day.
+
+    dateutil fills missing fields (e.g. the year in "Mar 15") from today, so
+    today is part of the cache key and entries never go stale.
+    """
+    default = datetime(today.year, today.month, today.day)
+    return dateutil_parser.parse(date_part, default=default).strftime("%Y-%m-%d")
+
+
+# Currency symbol and thousands separators dropped from rent strings in one pass
+_RENT_DROP_CHARS = str.maketrans("", "", "$,")
+
+
 # ---------------------------------------------------------------------------
 # Pydantic input model with field validators
 # ---------------------------------------------------------------------------
@@ -120,14 +144,19 @@ class UnitInput(BaseModel):
         # Strip "Starting at" prefix (Funnel-style floor plan pricing)
         if s_lower.startswith("starting at"):
             s = s[len("starting at"):].strip()
-        s = s.replace("$", "").replace(",", "").replace("/mo", "").strip()
+        s = s.translate(_RENT_DROP_CHARS).replace("/mo", "").strip()
         # Handle price ranges: "$2,211 – $2,799" or "$2211-$2799" — take the lower value
         for sep in [" – ", " - ", "–", "-"]:
             if sep in s:
-                parts = s.split(sep)
-                s = parts[0].replace("$", "").replace(",", "").strip()
+                s = s.split(sep)[0].strip()
                 break
-        # Convert to float first to handle ".00" and fractional cents, then to cents
+        # Whole dollars and dollars.cents are exact integer arithmetic; anything
+        # else (e.g. "1500.555") goes through float and rounds to the nearest cent
+        whole, dot, frac = s.partition(".")
+        if whole.isascii() and whole.isdigit() and (
+            not dot or (len(frac) <= 2 and frac.isascii() and frac.isdigit())
+        ):
+            return int(whole) * 100 + int(frac.ljust(2, "0") if dot else 0)
         try:
             cents = round(float(s) * 100)
         except ValueError:
@@ -152,17 +181,29 @@ class UnitInput(BaseModel):
         else:
             date_part = original
         try:
-            parsed = dateutil_parser.parse(date_part)
+            if _ISO_DATE_RE.fullmatch(date_part):
+                return date.fromisoformat(date_part).isoformat()
+            m = _US_DATE_RE.fullmatch(date_part)
+            if m:
+                month, day, year = m.groups()
+                return date(int(year), int(month), int(day)).isoformat()
+            return _parse_date_fallback(date_part, date.today())
         except (ValueError, TypeError) as exc:
             raise ValueError(f"Unknown string format: {v}") from exc
-        return parsed.strftime("%Y-%m-%d")
 
 
 # ---------------------------------------------------------------------------
 # Public normalize() function
 # ---------------------------------------------------------------------------
 
-def normalize(raw: dict, building_id: int) -> dict:
+_REQUIRED_FIELDS: tuple[str, ...] = tuple(
+    name for name, field in UnitInput.model_fields.items() if field.is_required()
+)
+
+
+def normalize(
+    raw: dict, building_id: int, *, scrape_run_at: datetime | None = None
+) -> dict:
     """
     Normalize raw scraper output to a DB-ready unit dict.
 
@@ -171,6 +212,7 @@ def normalize(raw: dict, building_id: int) -> dict:
              availability_date, and optionally floor_plan_name, floor_plan_url,
              baths, sqft.
         building_id: FK to the buildings table.
+        scrape_run_at: Timestamp to stamp on the unit; defaults to now (UTC).
 
     Returns:
         Dict with keys: building_id, unit_number, bed_type, non_canonical,
@@ -180,6 +222,42 @@ def normalize(raw: dict, building_id: int) -> dict:
     Raises:
         pydantic.ValidationError: if any required field is missing or unparseable.
     """
+    return _normalize(raw, building_id, scrape_run_at or datetime.now(timezone.utc))
+
+
+def normalize_batch(
+    raw_units: list[dict], building_id: int, *, scrape_run_at: datetime | None = None
+) -> list[dict]:
+    """
+    Normalize one scrape's raw units, skipping any that fail validation.
+
+    Rows with unparseable fields (e.g. rent="Call", missing bed type) are
+    dropped rather than raised. Every returned dict shares one scrape_run_at
+    (the given one, or the clock read once at the start of the batch).
+
+    Returns:
+        List of dicts shaped like normalize()'s output, in input order.
+    """
+    scrape_run_at = scrape_run_at or datetime.now(timezone.utc)
+    units = []
+    for raw in raw_units:
+        try:
+            units.append(_normalize(raw, building_id, scrape_run_at))
+        except (ValidationError, ValueError):
+            continue
+    return units
+
+
+def _normalize(raw: dict, building_id: int, scrape_run_at: datetime) -> dict:
+    """normalize() with the scrape timestamp supplied by the caller."""
+    # Fail rows with absent required keys before any field validator runs;
+    # same error type/shape pydantic would raise ("missing", loc=(field,))
+    missing = [f for f in _REQUIRED_FIELDS if f not in raw]
+    if missing:
+        raise ValidationError.from_exception_data(
+            UnitInput.__name__,
+            [{"type": "missing", "loc": (f,), "input": raw} for f in missing],
+        )
     inp = UnitInput(**raw)
     non_canonical = inp.bed_type not in CANONICAL_BED_TYPES
 
@@ -194,5 +272,5 @@ def normalize(raw: dict, building_id: int) -> dict:
         "floor_plan_url": inp.floor_plan_url,
         "baths": str(inp.baths) if inp.baths is not None else None,
         "sqft": int(inp.sqft) if inp.sqft is not None else None,
-        "scrape_run_at": datetime.now(timezone.utc),
+        "scrape_run_at": scrape_run_at,
     }
@@ -1,4 +1,5 @@
 """Batch scrape orchestrator: sheets_sync -> parallel scrape -> summary."""
+import asyncio
 import logging
 import threading
 from concurrent.futures import ThreadPoolExecutor, as_completed
@@ -7,7 +8,7 @@ from datetime import datetime, timedelta, timezone
 from moxie.db.models import Building
 from moxie.db.session import SessionLocal
 from moxie.scrapers.registry import PLATFORM_SCRAPERS, SKIP_PLATFORMS
-from moxie.scheduler.runner import scrape_one_building
+from moxie.scheduler.runner import BROWSER_DELAY, save_prefetched_result, scrape_one_building
 from moxie.sync.sheets import sheets_sync
 
 logger = logging.getLogger("moxie.scheduler")
@@ -35,6 +36,17 @@ _default_sem = threading.Semaphore(1)
 
 MAX_WORKERS = 8  # Thread pool size — most threads block on I/O or semaphore
 
+# Platforms served by the Tier 3 LLM scraper are scraped together via scrape_many()
+_LLM_MODULE = "moxie.scrapers.tier3.llm"
+
+# Renders in flight in the Tier 3 batch: the slots its platforms (llm, entrata,
+# mri) had as separate semaphores. That is the same peak the per-building path
+# allowed, but on one shared browser instead of one browser per scrape, so
+# memory stays at or below what those platforms could use before.
+LLM_BATCH_CONCURRENCY = sum(
+    n for p, n in PLATFORM_CONCURRENCY.items() if PLATFORM_SCRAPERS.get(p) == _LLM_MODULE
+)
+
 
 def _prune_old_runs(days: int = 30) -> int:
     """Delete scrape_runs rows older than `days` days. Returns count deleted."""
@@ -60,7 +72,49 @@ def _scrape_with_semaphore(building_id: int, name: str, url: str, platform: str)
         return scrape_one_building(building_id, name, url, platform)
 
 
-def run_batch(*, skip_sheets_sync: bool = False, dry_run: bool = False) -> list[dict]:
+def _scrape_llm_batch(
+    specs: list[tuple[int, str, str, str]], force_refresh: bool = False
+) -> list[dict]:
+    """
+    Scrape all Tier 3 buildings on one event loop and browser.
+
+    At most LLM_BATCH_CONCURRENCY buildings render at once, each followed by
+    the browser politeness delay, and each building is saved as soon as its outcome is known rather
+    than after the whole Message Batch has ended.
+    """
+    from moxie.scrapers.tier3 import llm  # local import keeps Crawl4AI off the import path
+
+    # Transient (never added to a session) — scrape_many only reads id and url
+    buildings = [Building(id=bid, name=name, url=url) for bid, name, url, _ in specs]
+    by_id = {bid: (name, platform) for bid, name, _url, platform in specs}
+    saved: dict[int, dict] = {}
+
+    def _save(building_id: int, outcome: list[dict] | BaseException) -> None:
+        name, platform = by_id[building_id]
+        saved[building_id] = save_prefetched_result(building_id, name, platform, outcome)
+
+    try:
+        asyncio.run(llm.scrape_many(
+            buildings,
+            concurrency=LLM_BATCH_CONCURRENCY,
+            force_refresh=force_refresh,
+            delay=BROWSER_DELAY,
+            on_outcome=_save,
+        ))
+    except Exception as e:
+        # scrape_many isolates per-building failures, so this is the batch
+        # itself failing (browser launch, a save error, ...). Record it for
+        # every building without a result yet, as scrape_one_building would.
+        logger.error(f"Tier 3 batch failed: {e}")
+        for bid, name, _url, platform in specs:
+            if bid not in saved:
+                saved[bid] = save_prefetched_result(bid, name, platform, e)
+    return [saved[bid] for bid, _name, _url, _platform in specs]
+
+
+def run_batch(
+    *, skip_sheets_sync: bool = False, dry_run: bool = False, force_refresh: bool = False
+) -> list[dict]:
     """
     Execute a full batch scrape cycle.
 
@@ -71,6 +125,7 @@ def run_batch(*, skip_sheets_sync: bool = False, dry_run: bool = False) -> list[
     Args:
         skip_sheets_sync: Skip the Sheets pull step (useful for testing)
         dry_run: Log which buildings would be scraped, but don't actually scrape
+        force_refresh: Ignore the LLM scraper's link and extraction caches
 
     Returns:
         List of result dicts from scrape_one_building
@@ -140,30 +195,41 @@ def run_batch(*, skip_sheets_sync: bool = False, dry_run: bool = False) -> list[
     completed = 0
     total = len(building_specs)
 
+    llm_specs = [s for s in building_specs if PLATFORM_SCRAPERS[s[3]] == _LLM_MODULE]
+    other_specs = [s for s in building_specs if PLATFORM_SCRAPERS[s[3]] != _LLM_MODULE]
+
     with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+        # Each future maps to the specs it covers: one building, or the whole LLM batch
         futures = {
-            pool.submit(_scrape_with_semaphore, bid, name, url, platform): (bid, name)
-            for bid, name, url, platform in building_specs
+            pool.submit(_scrape_with_semaphore, *spec): [spec]
+            for spec in other_specs
         }
+        if llm_specs:
+            futures[pool.submit(_scrape_llm_batch, llm_specs, force_refresh)] = llm_specs
         for future in as_completed(futures):
-            bid, name = futures[future]
+            specs = futures[future]
             try:
-                result = future.result()
+                outcome = future.result()
+                batch_results = outcome if isinstance(outcome, list) else [outcome]
             except Exception as e:
                 # Should not reach here — scrape_one_building handles all exceptions
-                result = {
-                    "building_id": bid,
-                    "building_name": name,
-                    "platform": "unknown",
-                    "status": "error",
-                    "unit_count": 0,
-                    "error": f"Unhandled: {e}",
-                    "scraped_at": datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M UTC"),
-                }
-            results.append(result)
-            completed += 1
-            if completed % 50 == 0 or completed == total:
-                logger.info(f"  Progress: {completed}/{total}")
+                batch_results = [
+                    {
+                        "building_id": bid,
+                        "building_name": name,
+                        "platform": "unknown",
+                        "status": "error",
+                        "unit_count": 0,
+                        "error": f"Unhandled: {e}",
+                        "scraped_at": datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M UTC"),
+                    }
+                    for bid, name, _url, _platform in specs
+                ]
+            for result in batch_results:
+                results.append(result)
+                completed += 1
+                if completed % 50 == 0 or completed == total:
+                    logger.info(f"  Progress: {completed}/{total}")
 
     # Summary
     elapsed = (datetime.now(timezone.utc) - start_time).total_seconds()
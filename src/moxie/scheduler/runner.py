@@ -2,14 +2,14 @@
 import importlib
 import logging
 import time
+from collections.abc import Callable
 from datetime import datetime, timezone
 
 from moxie.db.models import Building, Unit, ScrapeRun
 from moxie.db.session import SessionLocal
 from moxie.scrapers.base import save_scrape_result
 from moxie.scrapers.registry import PLATFORM_SCRAPERS
-from moxie.normalizer import normalize
-from pydantic import ValidationError
+from moxie.normalizer import normalize_batch
 
 logger = logging.getLogger("moxie.scheduler")
 
@@ -34,6 +34,47 @@ def scrape_one_building(building_id: int, building_name: str, building_url: str,
         dict with keys: building_id, building_name, platform, status ("success"|"failed"),
         unit_count (int), error (str|None), scraped_at (str ISO)
     """
+    def fetch(building: Building) -> list[dict]:
+        mod = importlib.import_module(PLATFORM_SCRAPERS[platform])
+        return mod.scrape(building)
+
+    result = _scrape_and_save(building_id, building_name, platform, fetch)
+
+    # Inter-scrape delay (politeness)
+    delay = BROWSER_DELAY if platform in _BROWSER_PLATFORMS else HTTP_DELAY
+    time.sleep(delay)
+
+    return result
+
+
+def save_prefetched_result(
+    building_id: int,
+    building_name: str,
+    platform: str,
+    outcome: list[dict] | BaseException,
+) -> dict:
+    """
+    Save units that were already scraped elsewhere (e.g. by a multi-building
+    scrape_many() call). An exception outcome is recorded exactly like a scraper
+    raising inside scrape_one_building().
+
+    Returns the same result dict as scrape_one_building().
+    """
+    def fetch(building: Building) -> list[dict]:
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return outcome
+
+    return _scrape_and_save(building_id, building_name, platform, fetch)
+
+
+def _scrape_and_save(
+    building_id: int,
+    building_name: str,
+    platform: str,
+    fetch: Callable[[Building], list[dict]],
+) -> dict:
+    """Run fetch(building) and persist its units, or record the failure it raised."""
     now = datetime.now(timezone.utc)
     result = {
         "building_id": building_id,
@@ -52,22 +93,15 @@ def scrape_one_building(building_id: int, building_name: str, building_url: str,
             result["error"] = f"Building ID {building_id} not found in DB"
             return result
 
-        # Import and call the scraper
-        mod = importlib.import_module(PLATFORM_SCRAPERS[platform])
-        raw_units: list[dict] = mod.scrape(building)
+        raw_units: list[dict] = fetch(building)
 
         # Save success: delete old units, insert new normalized units
+        # (unparseable ones are skipped), stamped with this run's timestamp
         db.query(Unit).filter(Unit.building_id == building.id).delete()
 
-        saved_count = 0
-        if raw_units:
-            for raw in raw_units:
-                try:
-                    unit_dict = normalize(raw, building.id)
-                    db.add(Unit(**unit_dict))
-                    saved_count += 1
-                except (ValidationError, ValueError):
-                    pass  # Skip unparseable units
+        unit_dicts = normalize_batch(raw_units, building.id, scrape_run_at=now)
+        db.add_all([Unit(**unit_dict) for unit_dict in unit_dicts])
+        saved_count = len(unit_dicts)
 
         # Update building status
         if saved_count > 0:
@@ -118,8 +152,4 @@ def scrape_one_building(building_id: int, building_name: str, building_url: str,
     finally:
         db.close()
 
-    # Inter-scrape delay (politeness)
-    delay = BROWSER_DELAY if platform in _BROWSER_PLATFORMS else HTTP_DELAY
-    time.sleep(delay)
-
     return result
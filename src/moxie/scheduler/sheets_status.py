@@ -4,7 +4,7 @@ from datetime import datetime, timezone
 
 import gspread
 
-from moxie.config import GOOGLE_SHEETS_ID, GOOGLE_SHEETS_KEY_PATH
+from moxie.sync.sheets import open_spreadsheet
 
 logger = logging.getLogger("moxie.scheduler")
 
@@ -68,8 +68,7 @@ def push_batch_status(results: list[dict]) -> None:
 
     # Push to Google Sheets
     try:
-        gc = gspread.service_account(filename=GOOGLE_SHEETS_KEY_PATH)
-        sh = gc.open_by_key(GOOGLE_SHEETS_ID)
+        sh = open_spreadsheet()
 
         try:
             ws = sh.worksheet("Scrape Status")
@@ -7,6 +7,7 @@ Usage:
     scrape-all --schedule         # Enter scheduled mode (2 AM Central daily, blocks)
     scrape-all --dry-run          # List buildings without scraping
     scrape-all --skip-sync        # Skip Google Sheets sync step
+    scrape-all --force-refresh    # Ignore LLM scraper caches (rediscover + re-extract)
 
 Entrypoint: moxie.scrape_all:main (registered as `scrape-all` in pyproject.toml)
 """
@@ -47,6 +48,12 @@ def main() -> None:
         default=False,
         help="Skip the Google Sheets building list sync step",
     )
+    parser.add_argument(
+        "--force-refresh",
+        action="store_true",
+        default=False,
+        help="Ignore the LLM scraper's cached subpage links and extractions (run-now only)",
+    )
     args = parser.parse_args()
 
     # Configure logging: rotating file + console
@@ -63,6 +70,7 @@ def main() -> None:
         results = run_batch(
             skip_sheets_sync=args.skip_sync,
             dry_run=args.dry_run,
+            force_refresh=args.force_refresh,
         )
 
         successes = sum(1 for r in results if r["status"] == "success")
@@ -6,10 +6,9 @@ save_scrape_result(): centralized DB write function called by all scrapers.
 """
 from datetime import datetime, timezone
 from typing import Protocol
-from pydantic import ValidationError
 from sqlalchemy.orm import Session
 from moxie.db.models import Building, Unit, ScrapeRun
-from moxie.normalizer import normalize
+from moxie.normalizer import normalize_batch
 
 CONSECUTIVE_ZERO_THRESHOLD = 5
 
@@ -52,16 +51,10 @@ def save_scrape_result(
         db.query(Unit).filter(Unit.building_id == building.id).delete()
 
         if raw_units:
-            saved_count = 0
-            for raw in raw_units:
-                try:
-                    unit_dict = normalize(raw, building.id)
-                    db.add(Unit(**unit_dict))
-                    saved_count += 1
-                except (ValidationError, ValueError):
-                    # Skip units with unparseable fields (e.g. rent="Call", missing bed type)
-                    pass
-            if saved_count > 0:
+            # Units with unparseable fields (e.g. rent="Call") are skipped
+            unit_dicts = normalize_batch(raw_units, building.id, scrape_run_at=now)
+            db.add_all([Unit(**unit_dict) for unit_dict in unit_dicts])
+            if unit_dicts:
                 building.consecutive_zero_count = 0
                 building.last_scrape_status = "success"
             else:
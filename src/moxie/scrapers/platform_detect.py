@@ -16,6 +16,7 @@ Platform strings:
   appfolio  -- AppFolio (appfolio.com)
   llm       -- everything else (assigned by caller when detect_platform returns None)
 """
+import functools
 from urllib.parse import urlparse
 
 # Ordered list: first match wins. More specific patterns before less specific.
@@ -42,6 +43,27 @@ KNOWN_PLATFORMS: frozenset[str] = frozenset({
 })
 
 
+# Domain -> platform, built from PLATFORM_PATTERNS (reversed so the first entry wins)
+_DOMAIN_PLATFORMS: dict[str, str] = {
+    domain: platform for platform, domain in reversed(PLATFORM_PATTERNS)
+}
+
+
+@functools.lru_cache(maxsize=2048)
+def _platform_for_host(hostname: str) -> str | None:
+    """Look up a lowercased hostname and each parent domain (memoized per host).
+
+    "a.b.rentcafe.com" tries "a.b.rentcafe.com", "b.rentcafe.com", then
+    "rentcafe.com", so only whole labels match -- "notrentcafe.com" does not.
+    """
+    labels = hostname.split(".")
+    for i in range(len(labels) - 1):
+        platform = _DOMAIN_PLATFORMS.get(".".join(labels[i:]))
+        if platform is not None:
+            return platform
+    return None
+
+
 def detect_platform(url: str) -> str | None:
     """
     Return the platform string for a given building URL, or None if unrecognized.
@@ -59,10 +81,8 @@ def detect_platform(url: str) -> str | None:
         return None
     try:
         parsed = urlparse(url.lower())
-        hostname = parsed.netloc or parsed.path
+        # Scheme-less URLs ("foo.rentcafe.com/x") parse with the host in .path
+        hostname = parsed.hostname or parsed.path.split("/", 1)[0].split(":", 1)[0]
     except Exception:
         return None
-    for platform, pattern in PLATFORM_PATTERNS:
-        if pattern in hostname:
-            return platform
-    return None
+    return _platform_for_host(hostname)
@@ -14,24 +14,73 @@ Coverage: ~218 RentCafe buildings with SecureCafe leasing portals
 """
 import asyncio
 import re
+import threading
+import time
 from urllib.parse import urlparse
 
-from bs4 import BeautifulSoup
 from crawl4ai import AsyncWebCrawler, CrawlerRunConfig, CacheMode
+from selectolax.lexbor import LexborHTMLParser
 
 from moxie.db.models import Building
 
 
+# One pass over each floor plan caption, e.g.
+#   "Apartment Details and Selection for Floor Plan: A1 - 1 Bed / 1 Bath"
+# The floor plan alternative is a zero-width lookahead so the name it captures
+# (which may itself contain "1 Bed") is still scanned by the bed/bath branches.
+_CAPTION_RE = re.compile(
+    r"(?=Floor Plan:\s*(?P<fp>.+?)(?:\s*-\s*|\s*$))"
+    r"|(?P<bed>\d+)\s*Bed"
+    r"|(?P<bath>[\d.]+)\s*Bath"
+    r"|(?P<studio>(?i:Studio))"
+)
+
+# "3/15/2026" in the Date Available cell
+_DATE_CELL_RE = re.compile(r"\d+/\d+/\d+")
+
+# Apartment cell unit number patterns, tried in this order
+_APT_BUILDING_RE = re.compile(r"#\d+-(\w+)")
+_APT_PLAIN_RE = re.compile(r"#(\w+)")
+
+# Date argument inside ApplyNowClick(...) on the Select button
+_APPLY_DATE_RE = re.compile(r"(\d{1,2}/\d{1,2}/\d{4})")
+
+# In-process memo of recent renders: url -> (monotonic time, html).
+# Short TTL so the long-running scheduler never serves yesterday's units.
+_RENDER_MEMO_TTL = 600.0
+_render_memo: dict[str, tuple[float, str]] = {}
+_render_memo_lock = threading.Lock()
+
+
 class SecureCafeScraperError(RuntimeError):
     """Raised on discovery or fetch failure."""
 
 
-async def _fetch_rendered_html(url: str) -> str:
-    """Use Crawl4AI (Playwright browser) to render JS-heavy pages."""
+async def _fetch_rendered_html(crawler: AsyncWebCrawler, url: str) -> str:
+    """Use Crawl4AI (Playwright browser) to render JS-heavy pages.
+
+    Bypasses Crawl4AI's persistent cache, but reuses a render of the same URL
+    from the last _RENDER_MEMO_TTL seconds — buildings that share one leasing
+    portal would otherwise render the identical availableunits page per building
+    in the same batch. Only the availableunits.aspx fetch goes through here;
+    the marketing-site discovery renders in _scrape_async() are not memoized.
+    """
+    now = time.monotonic()
+    with _render_memo_lock:
+        hit = _render_memo.get(url)
+    if hit and now - hit[0] < _RENDER_MEMO_TTL:
+        return hit[1]
+
     config = CrawlerRunConfig(cache_mode=CacheMode.BYPASS)
-    async with AsyncWebCrawler() as crawler:
-        result = await crawler.arun(url, config=config)
-    return result.html or ""
+    result = await crawler.arun(url, config=config)
+    html = result.html or ""
+
+    if html:
+        with _render_memo_lock:
+            for key in [k for k, (t, _) in _render_memo.items() if now - t >= _RENDER_MEMO_TTL]:
+                del _render_memo[key]
+            _render_memo[url] = (now, html)
+    return html
 
 
 def _discover_securecafe_url(html: str) -> str | None:
@@ -60,6 +109,29 @@ def _discover_securecafe_url(html: str) -> str | None:
     return full.group(1) if full else None
 
 
+def _parse_caption(text: str) -> tuple[str, str, str]:
+    """Return (bed_type, baths, floor_plan_name) from a floor plan caption."""
+    fp_name: str | None = None
+    bed_count: str | None = None
+    bath_count: str | None = None
+    is_studio = False
+    for m in _CAPTION_RE.finditer(text):
+        if m["fp"] is not None:
+            if fp_name is None:
+                fp_name = m["fp"].strip()
+        elif m["bed"]:
+            bed_count = bed_count or m["bed"]
+        elif m["bath"]:
+            bath_count = bath_count or m["bath"]
+        else:
+            is_studio = True
+
+    beds = "Studio" if is_studio else ""
+    if not is_studio and bed_count:
+        beds = f"{bed_count}BR" if bed_count != "1" else "1BR"
+    return beds, bath_count or "", fp_name or ""
+
+
 def _parse_available_units(html: str) -> list[dict]:
     """Parse the availableunits.aspx page for unit data.
 
@@ -71,141 +143,129 @@ def _parse_available_units(html: str) -> list[dict]:
     Floor plan bed/bath comes from section headers:
       "Apartment Details and Selection for Floor Plan: 1 Bed / 1 Bath - ..."
     """
-    soup = BeautifulSoup(html, "html.parser")
-    container = soup.select_one("div.availableunits")
-    if not container:
+    container = LexborHTMLParser(html).css_first("div.availableunits")
+    if container is None:
         return []
 
-    # Build a map of floor plan bed/bath from section headers
-    # Each table.availableUnits has a caption with the floor plan info
-    table_fp: dict[str, dict] = {}  # table id -> {beds, baths, fp_name}
-    for caption in container.select("caption"):
-        text = caption.get_text(strip=True)
-        fp_match = re.search(r"Floor Plan:\s*(.+?)(?:\s*-\s*|\s*$)", text)
-        fp_name = fp_match.group(1).strip() if fp_match else ""
-
-        bed_match = re.search(r"(\d+)\s*Bed", text)
-        bath_match = re.search(r"([\d.]+)\s*Bath", text)
-        studio_match = re.search(r"Studio", text, re.IGNORECASE)
-
-        beds = "Studio" if studio_match else ""
-        if not studio_match and bed_match:
-            beds = f"{bed_match.group(1)}BR" if bed_match.group(1) != "1" else "1BR"
-        baths = bath_match.group(1) if bath_match else ""
-
-        table = caption.parent
-        if table:
-            table_fp[id(table)] = {"beds": beds, "baths": baths, "fp_name": fp_name}
-
     units: list[dict] = []
+    # Hoisted out of the row loop — it runs once per unit across every building
+    append = units.append
+    apt_building_search = _APT_BUILDING_RE.search
+    apt_plain_search = _APT_PLAIN_RE.search
+    date_cell_search = _DATE_CELL_RE.search
+    apply_date_search = _APPLY_DATE_RE.search
+
+    # Each availableUnits table is one floor plan: parse its caption once,
+    # then read its rows with the bed/bath/floor plan already in hand.
+    for table in container.css("table"):
+        caption = table.css_first("caption")
+        bed_type, baths, fp_name = _parse_caption(
+            caption.text(strip=True) if caption is not None else ""
+        )
 
-    for row in container.select("tr.AvailUnitRow"):
-        # Unit number from th or td with data-label="Apartment"
-        apt_cell = row.find(attrs={"data-label": "Apartment"})
-        if not apt_cell:
-            apt_cell = row.find("th")
-        if not apt_cell:
-            continue
-
-        apt_text = apt_cell.get_text(strip=True)
-        # Some templates use "#buildingId-unitNum" (e.g. "#1435-406"),
-        # others use plain "#unitNum" (e.g. "#512").
-        apt_match = re.search(r"#\d+-(\w+)", apt_text) or re.search(r"#(\w+)", apt_text)
-        if not apt_match:
-            continue
-        unit_number = apt_match.group(1)
-
-        # SqFt from data-label="Sq.Ft."
-        sqft_cell = row.find(attrs={"data-label": "Sq.Ft."})
-        sqft = None
-        if sqft_cell:
-            sqft_text = sqft_cell.get_text(strip=True).replace(",", "")
-            if sqft_text.isdigit():
-                sqft = int(sqft_text)
-
-        # Rent from data-label="Rent"
-        rent_cell = row.find(attrs={"data-label": "Rent"})
-        rent = "N/A"
-        if rent_cell:
-            rent = rent_cell.get_text(strip=True)
-
-        # Date Available: check data-label="Date Available" cell first
-        avail = "Available Now"
-        date_cell = row.find(attrs={"data-label": "Date Available"})
-        if date_cell:
-            date_text = date_cell.get_text(strip=True)
-            if re.search(r"\d+/\d+/\d+", date_text):
-                avail = date_text
-            elif date_text.lower() in ("available", "available now", ""):
-                avail = "Available Now"
-
-        # Fallback: extract date from ApplyNowClick button onclick
-        if avail == "Available Now":
-            select_btn = row.find(attrs={"class": "UnitSelect"})
-            if select_btn:
-                onclick = select_btn.get("onclick", "")
-                date_match = re.search(r"(\d{1,2}/\d{1,2}/\d{4})", onclick)
-                if date_match:
-                    date_str = date_match.group(1)
-                    # 12/31/9999 = no date / available now
-                    if date_str != "12/31/9999":
-                        avail = date_str
-
-        # Bed/bath from parent table's caption
-        table = row.find_parent("table")
-        fp_info = table_fp.get(id(table), {}) if table else {}
-        bed_type = fp_info.get("beds", "")
-        baths = fp_info.get("baths", "")
-        fp_name = fp_info.get("fp_name", "")
-
-        units.append({
-            "unit_number": unit_number,
-            "floor_plan_name": fp_name,
-            "bed_type": bed_type,
-            "baths": baths,
-            "sqft": sqft,
-            "rent": rent,
-            "availability_date": avail,
-        })
+        for row in table.css("tr.AvailUnitRow"):
+            # Unit number from th or td with data-label="Apartment"
+            apt_cell = row.css_first('[data-label="Apartment"]') or row.css_first("th")
+            if apt_cell is None:
+                continue
+
+            apt_text = apt_cell.text(strip=True)
+            # Some templates use "#buildingId-unitNum" (e.g. "#1435-406"),
+            # others use plain "#unitNum" (e.g. "#512").
+            apt_match = apt_building_search(apt_text) or apt_plain_search(apt_text)
+            if not apt_match:
+                continue
+            unit_number = apt_match.group(1)
+
+            # SqFt from data-label="Sq.Ft."
+            sqft_cell = row.css_first('[data-label="Sq.Ft."]')
+            sqft = None
+            if sqft_cell is not None:
+                sqft_text = sqft_cell.text(strip=True).replace(",", "")
+                if sqft_text.isdigit():
+                    sqft = int(sqft_text)
+
+            # Rent from data-label="Rent"
+            rent_cell = row.css_first('[data-label="Rent"]')
+            rent = "N/A"
+            if rent_cell is not None:
+                rent = rent_cell.text(strip=True)
+
+            # Date Available: check data-label="Date Available" cell first
+            avail = "Available Now"
+            date_cell = row.css_first('[data-label="Date Available"]')
+            if date_cell is not None:
+                date_text = date_cell.text(strip=True)
+                # "/" gate keeps the regex off the common "Available" / empty cells
+                if "/" in date_text and date_cell_search(date_text):
+                    avail = date_text
+                elif date_text.lower() in ("available", "available now", ""):
+                    avail = "Available Now"
+
+            # Fallback: extract date from ApplyNowClick button onclick
+            if avail == "Available Now":
+                select_btn = row.css_first(".UnitSelect")
+                if select_btn is not None:
+                    onclick = select_btn.attributes.get("onclick") or ""
+                    date_match = apply_date_search(onclick)
+                    if date_match:
+                        date_str = date_match.group(1)
+                        # 12/31/9999 = no date / available now
+                        if date_str != "12/31/9999":
+                            avail = date_str
+
+            append({
+                "unit_number": unit_number,
+                "floor_plan_name": fp_name,
+                "bed_type": bed_type,
+                "baths": baths,
+                "sqft": sqft,
+                "rent": rent,
+                "availability_date": avail,
+            })
 
     return units
 
 
-def scrape(building: Building) -> list[dict]:
-    """
-    Scrape unit availability from a SecureCafe-powered building.
-
-    1. Renders the marketing site (and subpages) to discover the SecureCafe URL.
-    2. Constructs and fetches the availableunits.aspx page.
-    3. Parses floor plan sections and unit rows from rendered HTML.
-    """
+async def _scrape_async(building: Building) -> list[dict]:
+    """Run discovery and the availableunits fetch on one shared browser."""
     # Step 1: Discover SecureCafe URL from marketing site.
     # Try homepage first, then common floor plan subpages — some buildings only
     # link to SecureCafe from their floorplans/floor-plans page.
     base_url: str | None = None
     base_site = building.url.rstrip("/")
     candidate_urls = [
-        building.url,
+        base_site,
         f"{base_site}/floorplans",
         f"{base_site}/floor-plans",
     ]
 
-    for candidate in candidate_urls:
-        marketing_html = asyncio.run(_fetch_rendered_html(candidate))
-        if not marketing_html:
-            continue
-        base_url = _discover_securecafe_url(marketing_html)
-        if base_url:
-            break
-
-    if not base_url:
-        raise SecureCafeScraperError(
-            f"No SecureCafe URL found on {building.url} or its floorplans subpages"
+    async with AsyncWebCrawler() as crawler:
+        # Render all candidates in parallel pages; keep homepage-first priority
+        # when picking which one's SecureCafe link to use.
+        # Bypass Crawl4AI's cache: its entries never expire, so a building that
+        # moved leasing portals would keep resolving to the old one forever.
+        results = await crawler.arun_many(
+            candidate_urls, config=CrawlerRunConfig(cache_mode=CacheMode.BYPASS)
         )
+        priority = {url: i for i, url in enumerate(candidate_urls)}
+        for result in sorted(results, key=lambda r: priority.get(r.url, len(priority))):
+            marketing_html = result.html or ""
+            if not marketing_html:
+                continue
+            base_url = _discover_securecafe_url(marketing_html)
+            if base_url:
+                break
+
+        if not base_url:
+            raise SecureCafeScraperError(
+                f"No SecureCafe URL found on {building.url} or its floorplans subpages"
+            )
+
+        # Step 2: Construct and fetch availableunits page
+        available_url = f"{base_url}/availableunits.aspx"
+        units_html = await _fetch_rendered_html(crawler, available_url)
 
-    # Step 2: Construct and fetch availableunits page
-    available_url = f"{base_url}/availableunits.aspx"
-    units_html = asyncio.run(_fetch_rendered_html(available_url))
     if not units_html:
         raise SecureCafeScraperError(
             f"Crawl4AI returned empty HTML for {available_url}"
@@ -213,3 +273,16 @@ def scrape(building: Building) -> list[dict]:
 
     # Step 3: Parse units
     return _parse_available_units(units_html)
+
+
+def scrape(building: Building) -> list[dict]:
+    """
+    Scrape unit availability from a SecureCafe-powered building.
+
+    1. Renders the marketing site (and subpages) to discover the SecureCafe URL.
+    2. Constructs and fetches the availableunits.aspx page.
+    3. Parses floor plan sections and unit rows from rendered HTML.
+
+    A single Crawl4AI browser is launched and reused for every page.
+    """
+    return asyncio.run(_scrape_async(building))
@@ -14,10 +14,14 @@ page's ``__APP_CONFIG__``.
 Platform: 'sightmap'
 Coverage: ~10 buildings (AMLI, LUXE, EMME, Trio, Next — verified 2026-02-19)
 """
+import asyncio
+import atexit
 import json
 import re
+from urllib.parse import urljoin, urlparse
 
 import httpx
+import orjson
 
 from moxie.db.models import Building
 
@@ -29,19 +33,32 @@ _HEADERS = {
     ),
 }
 
+# Shared across buildings so sync requests to sightmap.com reuse pooled
+# connections (and their TLS sessions) instead of handshaking per call.
+_CLIENT = httpx.Client(timeout=30.0, headers=_HEADERS, follow_redirects=True)
+atexit.register(_CLIENT.close)
 
-class SightMapScraperError(RuntimeError):
-    """Raised on HTTP error or missing SightMap configuration."""
+# Exclude the loader script sightmap.com/embed/api.js — we want the embed ID
+_EMBED_ID_RE = re.compile(r"sightmap\.com/embed/(?!api(?:\.js)?)([a-z0-9]+)", re.IGNORECASE)
 
+# Rolling buffer bounds for streamed candidate pages (characters)
+_STREAM_BUFFER_LIMIT = 200_000
+_STREAM_OVERLAP = 4096
 
-def _extract_embed_id(building_url: str) -> str:
-    """Fetch the building's marketing site and extract the SightMap embed ID.
+# ``window.__APP_CONFIG__ = {...}`` — raw_decode() starts at the end of this match
+_APP_CONFIG_RE = re.compile(r"__APP_CONFIG__\s*=\s*")
+_JSON_DECODER = json.JSONDecoder()
+
+# Stand-in for units whose floor_plan_id is missing or unknown
+_NO_FLOOR_PLAN = ("", "", "")
 
-    Checks the root URL first, then common subpages where the map widget
-    is typically embedded (``/floorplans``, ``/floor-plans``, ``/availability``).
-    """
-    from urllib.parse import urlparse, urljoin
 
+class SightMapScraperError(RuntimeError):
+    """Raised on HTTP error or missing SightMap configuration."""
+
+
+def _candidate_urls(building_url: str) -> list[str]:
+    """Return the building URL followed by the subpages where the map is usually embedded."""
     parsed = urlparse(building_url.rstrip("/"))
     base = f"{parsed.scheme}://{parsed.netloc}"
     urls_to_try = [building_url]
@@ -49,77 +66,119 @@ def _extract_embed_id(building_url: str) -> str:
         candidate = urljoin(base + "/", subpath.lstrip("/"))
         if candidate not in urls_to_try:
             urls_to_try.append(candidate)
+    return urls_to_try
+
+
+async def _fetch_embed_id(client: httpx.AsyncClient, url: str) -> str | None:
+    """Stream one candidate page and return its SightMap embed ID, or None.
 
-    with httpx.Client(timeout=30.0, headers=_HEADERS, follow_redirects=True) as client:
-        for url in urls_to_try:
-            try:
-                r = client.get(url)
-            except httpx.HTTPError:
-                continue
+    The body is scanned chunk by chunk and the download stops at the first
+    match, so the rest of a large marketing page is never read.
+    """
+    try:
+        async with client.stream("GET", url) as r:
             if r.status_code != 200:
-                continue
-            # Exclude the loader script sightmap.com/embed/api.js — we want the embed ID
-            match = re.search(r"sightmap\.com/embed/(?!api(?:\.js)?)([a-z0-9]+)", r.text, re.IGNORECASE)
-            if match:
-                return match.group(1)
+                return None
+            buf = ""
+            async for chunk in r.aiter_text():
+                # Rescan a short overlap so a URL split across chunks still matches
+                scan_from = max(0, len(buf) - _STREAM_OVERLAP)
+                buf += chunk
+                match = _EMBED_ID_RE.search(buf, scan_from)
+                # A match touching the end of the buffer may be a truncated ID
+                if match and match.end() < len(buf):
+                    return match.group(1)
+                if len(buf) > _STREAM_BUFFER_LIMIT:
+                    buf = buf[-_STREAM_OVERLAP:]
+    except httpx.HTTPError:
+        return None
+    match = _EMBED_ID_RE.search(buf)
+    return match.group(1) if match else None
+
+
+async def _extract_embed_id_async(building_url: str) -> str:
+    """Fetch all candidate pages concurrently and return the best embed ID found.
+
+    Candidates keep their _candidate_urls() priority (building URL first): the
+    first page in that order with a match wins, and every lower-priority
+    request still in flight is cancelled. Wall time is bounded by the slowest
+    page up to the winning one rather than the sum of all RTTs.
+    """
+    urls_to_try = _candidate_urls(building_url)
+
+    async with httpx.AsyncClient(timeout=30.0, headers=_HEADERS, follow_redirects=True) as client:
+        tasks = [asyncio.create_task(_fetch_embed_id(client, url)) for url in urls_to_try]
+        try:
+            for task in tasks:
+                embed_id = await task
+                if embed_id:
+                    return embed_id
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
 
     raise SightMapScraperError(
         f"No SightMap embed found on {building_url} (checked {len(urls_to_try)} pages)"
     )
 
 
+def _extract_embed_id(building_url: str) -> str:
+    """Fetch the building's marketing site and extract the SightMap embed ID.
+
+    Checks the root URL and common subpages where the map widget is typically
+    embedded (``/floorplans``, ``/floor-plans``, ``/availability``) in parallel.
+    """
+    return asyncio.run(_extract_embed_id_async(building_url))
+
+
 def _resolve_api_url(embed_id: str) -> str:
     """Fetch the SightMap embed page and extract the API URL from __APP_CONFIG__."""
-    with httpx.Client(timeout=30.0, headers=_HEADERS, follow_redirects=True) as client:
-        r = client.get(f"https://sightmap.com/embed/{embed_id}")
+    r = _CLIENT.get(f"https://sightmap.com/embed/{embed_id}")
     if r.status_code != 200:
         raise SightMapScraperError(
             f"SightMap embed page returned HTTP {r.status_code} for embed ID {embed_id}"
         )
-    idx = r.text.find("__APP_CONFIG__")
-    if idx < 0:
+    m = _APP_CONFIG_RE.search(r.text)
+    if not m:
         raise SightMapScraperError(
             f"No __APP_CONFIG__ found in SightMap embed page for {embed_id}"
         )
-    eq_idx = r.text.index("=", idx)
-    json_start = r.text.index("{", eq_idx)
-    depth = 0
-    for i in range(json_start, len(r.text)):
-        if r.text[i] == "{":
-            depth += 1
-        elif r.text[i] == "}":
-            depth -= 1
-            if depth == 0:
-                config = json.loads(r.text[json_start : i + 1])
-                return config["sightmaps"][0]["href"]
-    raise SightMapScraperError(
-        f"Failed to parse __APP_CONFIG__ JSON for embed ID {embed_id}"
-    )
+    try:
+        config, _end = _JSON_DECODER.raw_decode(r.text, m.end())
+    except json.JSONDecodeError as exc:
+        raise SightMapScraperError(
+            f"Failed to parse __APP_CONFIG__ JSON for embed ID {embed_id}"
+        ) from exc
+    return config["sightmaps"][0]["href"]
 
 
 def _fetch_units(api_url: str) -> list[dict]:
     """Call the SightMap API and return raw unit dicts."""
-    with httpx.Client(timeout=30.0, headers=_HEADERS) as client:
-        r = client.get(api_url)
+    r = _CLIENT.get(api_url)
     if r.status_code != 200:
         raise SightMapScraperError(
             f"SightMap API returned HTTP {r.status_code} for {api_url}"
         )
-    data = r.json()["data"]
-    floor_plans = {fp["id"]: fp for fp in data.get("floor_plans", [])}
+    data = orjson.loads(r.content)["data"]
+    # floor plan id -> (name, bedroom label, bathroom label)
+    floor_plans = {
+        fp["id"]: (fp.get("name", ""), fp.get("bedroom_label", ""), fp.get("bathroom_label", ""))
+        for fp in data.get("floor_plans", ())
+    }
 
     units = []
-    for u in data.get("units", []):
-        fp = floor_plans.get(u.get("floor_plan_id"), {})
+    for u in data.get("units", ()):
         area = u.get("area")
         # Skip placeholder units (e.g. floor plan "TEMP" with area=1)
         if area is not None and area <= 1:
             continue
+        fp_name, bed_label, bath_label = floor_plans.get(u.get("floor_plan_id"), _NO_FLOOR_PLAN)
         units.append({
             "unit_number": u.get("unit_number", "N/A"),
-            "floor_plan_name": fp.get("name", ""),
-            "bed_type": fp.get("bedroom_label", ""),
-            "baths": fp.get("bathroom_label", ""),
+            "floor_plan_name": fp_name,
+            "bed_type": bed_label,
+            "baths": bath_label,
             "sqft": area,
             "rent": f"${u['price']}" if u.get("price") else "N/A",
             "availability_date": u.get("display_available_on", "Available Now"),
@@ -12,36 +12,55 @@ How it works:
    /floorplans/all, /apartments) -- if one contains availability content it
    becomes the extraction target without going through link scoring.
 3. Internal links are scanned for an availability/floor-plans subpage;
-   if one is found it becomes the extraction target (two-pass approach)
-4. Crawl4AI converts HTML to markdown (5-10x token reduction vs raw HTML)
-5. LLMExtractionStrategy sends markdown to Claude Haiku with a Pydantic schema
-6. Claude Haiku returns a JSON list of UnitRecord objects
-7. Scraper returns the list for normalize() / save_scrape_result()
+   if one is found it becomes the extraction target (two-pass approach).
+   The outcome of steps 2-3 is cached per building URL for a week.
+4. Crawl4AI converts HTML to markdown (5-10x token reduction vs raw HTML),
+   then long pages are cut to their densest unit-listing region
+5. Pages with almost no unit content (prices, beds, sqft, ...) stop here.
+   If the markdown hashes the same as the last run for that URL, the cached
+   extraction is reused and no LLM call is made
+6. Otherwise the markdown goes to Claude Haiku with the extraction instruction and
+   unit JSON schema as the system prompt
+   (scrape_many() instead sends every changed page in one Message Batches request)
+7. Claude Haiku returns a JSON list of UnitRecord objects
+8. Scraper returns the list for normalize() / save_scrape_result()
 
 Cost estimate (Claude Haiku 3, as of 2026-02-18):
 - ~5,000-20,000 tokens per page -> ~$0.15-$0.30/day for 60 buildings
 - ~$4.50-$9/month -- well under the $120/month target
 
-Provider: "anthropic/claude-3-haiku-20240307" (via LiteLLM in Crawl4AI)
+Model: "claude-3-haiku-20240307" (Anthropic SDK, called directly)
 Requires: ANTHROPIC_API_KEY in environment
 
 Platform: 'llm'
 Coverage: ~80-110 buildings (custom sites + Entrata)
 """
 import asyncio
-import json
+import contextlib
+import functools
+import hashlib
+import logging
 import os
+import re
+import sqlite3
+import time
+from collections.abc import Callable
 from typing import Optional
 from urllib.parse import urljoin, urlparse
 
+import httpx
+import msgspec
+from anthropic import AsyncAnthropic
 from pydantic import BaseModel
-from crawl4ai import AsyncWebCrawler, CrawlerRunConfig, CacheMode, LLMConfig
-from crawl4ai.extraction_strategy import LLMExtractionStrategy
+from crawl4ai import AsyncWebCrawler, CrawlerRunConfig, CacheMode
 
+from moxie.config import LLM_CACHE_PATH
 from moxie.db.models import Building
 
-# Claude Haiku model via LiteLLM provider string
-_HAIKU_PROVIDER = "anthropic/claude-3-haiku-20240307"
+logger = logging.getLogger("moxie.scheduler")
+
+# Claude Haiku model used for extraction
+_HAIKU_MODEL = "claude-3-haiku-20240307"
 
 # Keywords used to score internal links for availability relevance.
 # Matched against both the href path and the link text (both lowercased).
@@ -75,9 +94,95 @@ _CONTENT_KEYWORDS = frozenset({
     "sq ft", "sqft", "move-in", "$", "rent", "lease",
 })
 
-# Delay (seconds) before extracting HTML from a JS-rendered page.
+
+def _keyword_re(keywords: frozenset[str], flags: int = 0) -> re.Pattern:
+    """Compile a keyword set into one alternation so a text is scanned once, in C."""
+    return re.compile("|".join(map(re.escape, sorted(keywords, key=len, reverse=True))), flags)
+
+
+_AVAILABILITY_RE = _keyword_re(_AVAILABILITY_KEYWORDS)
+_SKIP_RE = _keyword_re(_SKIP_KEYWORDS)
+# Case-insensitive so probed page markdown is never copied just to lowercase it
+_CONTENT_RE = _keyword_re(_CONTENT_KEYWORDS, re.IGNORECASE)
+
+# Max buildings rendered at once by scrape_many(). Each can hold up to five
+# browser pages (homepage + subpage probes) at ~150MB apiece.
+_SCRAPE_MANY_CONCURRENCY = 6
+
+# Output cap for one extraction reply (a JSON array of units)
+_MAX_TOKENS = 4096
+
+# How often scrape_many() polls its Message Batch until it has ended
+_BATCH_POLL_SECONDS = 30.0
+
+# A batch can take up to 24h to end. Past this wait it is canceled and its
+# pages are extracted with direct Messages calls instead (at most
+# _DIRECT_FALLBACK_CONCURRENCY at once), so a slow batch can't hold up the
+# scheduler run and the availability push behind it
+_BATCH_MAX_WAIT_SECONDS = 30 * 60
+_DIRECT_FALLBACK_CONCURRENCY = 4
+
+# Explicit subpages are first fetched over plain HTTP: missing pages are
+# dropped and static pages decided without launching a browser render
+_HTTP_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/120.0.0.0 Safari/537.36"
+    ),
+}
+_PRECHECK_TIMEOUT = 5.0
+_PRECHECK_MAX_CHARS = 50_000
+_HTML_SCRIPT_RE = re.compile(r"<(script|style)\b.*?</\1\s*>", re.IGNORECASE | re.DOTALL)
+_HTML_TAG_RE = re.compile(r"<[^>]+>")
+
+# Listing evidence: prices, sizes, bed types and unit numbers as whole tokens.
+# Unlike _CONTENT_RE this does not score "unit" in "community", "rent" in
+# "current" or "lease" in "please", so ordinary marketing copy stays near zero.
+_LISTING_RE = re.compile(
+    r"\$\s?\d[\d,]*"                                          # $1,850
+    r"|\b\d[\d,]*\s*(?:sq\.?\s*ft|sqft|sf)\b"                  # 650 sq ft
+    r"|\b(?:\d\s*(?:bd|br|beds?|bedrooms?)|studio)\b"          # 1 Bed, 2BR, Studio
+    r"|\bunit\s*#?\s*[a-z]?-?\d+[a-z]?\b",                      # Unit 1204, Unit #B-3
+    re.IGNORECASE,
+)
+
+# A homepage with at least this many _LISTING_RE hits -- roughly three
+# listings' worth -- is taken as the availability page itself, skipping
+# subpage discovery
+_HOMEPAGE_MIN_LISTING_HITS = 12
+
+# A subpage's static HTML needs this many _LISTING_RE hits -- about one full
+# listing -- before _http_precheck() trusts it without a browser render. A
+# stray "Studio from $1,500" in a soft-404's footer stays below it.
+_PRECHECK_MIN_LISTING_HITS = 4
+
+# Markdown sent to Claude is cut to the densest availability region of at most
+# this many characters (~6K tokens), plus a few lines of context either side
+_FOCUS_WINDOW_CHARS = 24_000
+_FOCUS_CONTEXT_LINES = 20
+
+# A page with fewer content-keyword hits than this lists no units -- Claude
+# would only answer "[]", so the call is skipped
+_MIN_EXTRACT_CONTENT_HITS = 3
+
+# How long a building's Pass 1 result (its availability subpage) is reused
+_LINK_CACHE_TTL = 7 * 24 * 3600
+
 # Entrata/MRI pages load unit data asynchronously — we must wait for it.
+# Rendering waits until a unit/floor-plan/availability element is in the DOM,
+# for at most _JS_LOAD_DELAY seconds, then settles for _JS_SETTLE_DELAY so the
+# rest of the list can paint. A js: predicate (unlike css:) gives up quietly at
+# the timeout instead of failing the crawl, so pages without such markup
+# still come back after the cap.
 _JS_LOAD_DELAY = 3.0
+_JS_SETTLE_DELAY = 0.5
+# (Bare [class*='unit'] would also match "community", "opportunity", ...)
+_UNIT_DOM_SELECTOR = (
+    "[class*='unit-'], [class*='-unit'], [class*='units'], [class*='floor-plan'], "
+    "[class*='floorplan'], [class*='availab'], [data-testid*='unit']"
+)
+_WAIT_FOR_UNITS = f'js:() => document.querySelector("{_UNIT_DOM_SELECTOR}") !== null'
 
 
 # Structured extraction schema -- matches UnitInput fields in normalizer.py
@@ -91,6 +196,26 @@ class _UnitRecord(BaseModel):
     sqft: Optional[str] = None
 
 
+# Built once at import; embedded in the extraction system prompt
+_UNIT_SCHEMA: dict = _UnitRecord.model_json_schema()
+
+
+# Validation mirror of _UnitRecord for decoding Claude's output in C.
+# Optional fields also accept numbers -- the LLM often returns sqft/baths unquoted.
+class _UnitStruct(msgspec.Struct):
+    unit_number: str
+    bed_type: str
+    rent: str
+    availability_date: str
+    floor_plan_name: Optional[str] = None
+    baths: Optional[str | int | float] = None
+    sqft: Optional[str | int | float] = None
+
+
+# The outer list is decoded lazily so one malformed record only drops that record
+_ITEMS_DECODER = msgspec.json.Decoder(list[msgspec.Raw])
+_UNIT_DECODER = msgspec.json.Decoder(_UnitStruct)
+
 _EXTRACTION_INSTRUCTION = (
     "Extract every available apartment listing from this page. "
     "A listing may be an individual unit (preferred) or a floor plan with available units. "
@@ -120,6 +245,21 @@ _EXTRACTION_INSTRUCTION = (
     "Return an empty list if no available listings with a price are found."
 )
 
+# Identical on every extraction request. Not marked for prompt caching: at
+# ~560 tokens it is under Haiku's 2048-token cacheable minimum, so a
+# cache_control marker would be silently ignored. The reply is prefilled with
+# "[" (see _extraction_params) so Claude answers with the bare JSON array.
+_SYSTEM_BLOCKS = [
+    {
+        "type": "text",
+        "text": (
+            _EXTRACTION_INSTRUCTION
+            + "\n\nRespond with only a JSON array of objects matching this JSON schema:\n"
+            + msgspec.json.encode(_UNIT_SCHEMA).decode()
+        ),
+    }
+]
+
 # Rent values from the LLM that signal the price was not actually extracted
 _RENT_PLACEHOLDER_VALUES = frozenset({
     "", "n/a", "tbd", "call", "contact", "call for pricing",
@@ -127,34 +267,177 @@ _RENT_PLACEHOLDER_VALUES = frozenset({
 })
 
 
+class LLMScraperError(RuntimeError):
+    """Raised when a batched extraction does not succeed for a building."""
+
+
+def _cache_connect() -> sqlite3.Connection:
+    """Open the on-disk LLM cache, creating its tables on first use."""
+    conn = sqlite3.connect(LLM_CACHE_PATH)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS llm_extractions "
+        "(url TEXT PRIMARY KEY, digest TEXT NOT NULL, content TEXT NOT NULL)"
+    )
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS availability_links "
+        "(base_url TEXT PRIMARY KEY, target_url TEXT, ts INTEGER NOT NULL)"
+    )
+    return conn
+
+
+def _cache_get(url: str, digest: str) -> str | None:
+    """Return the cached extraction for url if its page markdown still hashes to digest."""
+    if not LLM_CACHE_PATH:
+        return None
+    conn = _cache_connect()
+    try:
+        row = conn.execute(
+            "SELECT content FROM llm_extractions WHERE url = ? AND digest = ?",
+            (url, digest),
+        ).fetchone()
+    finally:
+        conn.close()
+    return row[0] if row else None
+
+
+def _cache_put(url: str, digest: str, content: str) -> None:
+    """Store the extraction for url, replacing any entry for an older page version."""
+    if not LLM_CACHE_PATH:
+        return
+    conn = _cache_connect()
+    try:
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_extractions (url, digest, content) VALUES (?, ?, ?)",
+                (url, digest, content),
+            )
+    finally:
+        conn.close()
+
+
+def _link_cache_get(url: str) -> tuple[bool, str | None]:
+    """
+    Return (hit, target_url) for a Pass 1 result cached within _LINK_CACHE_TTL.
+
+    target_url is None on a hit when Pass 1 found no better page than url itself.
+    """
+    if not LLM_CACHE_PATH:
+        return False, None
+    conn = _cache_connect()
+    try:
+        row = conn.execute(
+            "SELECT target_url FROM availability_links WHERE base_url = ? AND ts >= ?",
+            (url, int(time.time()) - _LINK_CACHE_TTL),
+        ).fetchone()
+    finally:
+        conn.close()
+    return (True, row[0]) if row else (False, None)
+
+
+def _link_cache_put(url: str, target_url: str | None) -> None:
+    """Store the Pass 1 result for url (None = no better subpage found)."""
+    if not LLM_CACHE_PATH:
+        return
+    conn = _cache_connect()
+    try:
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO availability_links (base_url, target_url, ts) "
+                "VALUES (?, ?, ?)",
+                (url, target_url, int(time.time())),
+            )
+    finally:
+        conn.close()
+
+
+def _link_cache_forget(url: str) -> None:
+    """Drop the cached Pass 1 result for url so the next run probes again."""
+    if not LLM_CACHE_PATH:
+        return
+    conn = _cache_connect()
+    try:
+        with conn:
+            conn.execute("DELETE FROM availability_links WHERE base_url = ?", (url,))
+    finally:
+        conn.close()
+
+
+# Pure function of its strings; nav links repeat across runs and across
+# buildings on shared site templates
+@functools.lru_cache(maxsize=2048)
 def _score_link(href: str, text: str) -> int:
     """Return a relevance score for an internal link. Higher = more likely to be the availability page."""
     href_l = href.lower()
     text_l = text.lower()
+    # Newline never appears in a keyword, so no match can straddle href and text
+    combined = f"{href_l}\n{text_l}"
 
-    if any(kw in href_l or kw in text_l for kw in _SKIP_KEYWORDS):
+    if _SKIP_RE.search(combined):
+        return 0
+    # Most links match nothing; only count per-keyword when the single scan hits
+    if not _AVAILABILITY_RE.search(combined):
         return 0
 
-    return sum(1 for kw in _AVAILABILITY_KEYWORDS if kw in href_l or kw in text_l)
+    return sum(1 for kw in _AVAILABILITY_KEYWORDS if kw in combined)
 
 
+@functools.lru_cache(maxsize=1024)
 def _base_url(url: str) -> str:
     """Extract scheme + netloc from a URL (e.g. 'https://example.com')."""
     parsed = urlparse(url)
     return f"{parsed.scheme}://{parsed.netloc}"
 
 
+async def _http_precheck(http: httpx.AsyncClient, url: str) -> bool | None:
+    """
+    Cheap plain-HTTP look at a subpage before spending a browser render on it.
+
+    Reads at most _PRECHECK_MAX_CHARS of the body. Returns False if the page
+    does not exist (404/410), True if its static text (scripts, styles and tags
+    stripped) already shows at least _PRECHECK_MIN_LISTING_HITS listing tokens,
+    and None when only a rendered page can tell -- other statuses, network
+    errors, JS-only content, or a page (soft 404, homepage redirect) whose only
+    matches are nav/footer mentions.
+    """
+    try:
+        async with http.stream("GET", url) as r:
+            if r.status_code in (404, 410):
+                return False
+            if r.status_code != 200:
+                return None
+            body = ""
+            async for chunk in r.aiter_text():
+                body += chunk
+                if len(body) >= _PRECHECK_MAX_CHARS:
+                    break
+    except httpx.HTTPError:
+        return None
+
+    text = _HTML_TAG_RE.sub(" ", _HTML_SCRIPT_RE.sub(" ", body))
+    return True if len(_LISTING_RE.findall(text)) >= _PRECHECK_MIN_LISTING_HITS else None
+
+
+async def _probe_candidate(crawler: AsyncWebCrawler, http: httpx.AsyncClient, url: str) -> bool:
+    """Probe one explicit subpage: HTTP precheck first, browser render only if undecided."""
+    verdict = await _http_precheck(http, url)
+    if verdict is not None:
+        return verdict
+    return await _probe_subpage(crawler, url)
+
+
 async def _probe_subpage(crawler: AsyncWebCrawler, url: str) -> bool:
     """
     Fetch a URL via Crawl4AI and return True if it appears to contain
     availability/unit content.
 
-    Uses a short JS load delay so dynamically-rendered content (Entrata
-    React widgets, etc.) has time to populate before we check.
+    Waits (up to _JS_LOAD_DELAY) for unit markup to appear so dynamically
+    rendered content (Entrata React widgets, etc.) is present before we check.
     """
     config = CrawlerRunConfig(
         cache_mode=CacheMode.BYPASS,
-        delay_before_return_html=_JS_LOAD_DELAY,
+        wait_for=_WAIT_FOR_UNITS,
+        wait_for_timeout=int(_JS_LOAD_DELAY * 1000),
+        delay_before_return_html=_JS_SETTLE_DELAY,
         page_timeout=20000,
     )
     try:
@@ -165,62 +448,119 @@ async def _probe_subpage(crawler: AsyncWebCrawler, url: str) -> bool:
     if not result.success or result.status_code not in (200, 301, 302):
         return False
 
-    content_lower = (result.markdown or "").lower()
-    return any(kw in content_lower for kw in _CONTENT_KEYWORDS)
+    return _CONTENT_RE.search(result.markdown or "") is not None
+
+
+def _crawler_scope(crawler: AsyncWebCrawler | None):
+    """Async context yielding the given crawler, or a fresh one if none was passed.
+
+    Lets scrape_many() share one browser across buildings while single-building
+    callers keep launching their own.
+    """
+    if crawler is not None:
+        return contextlib.nullcontext(crawler)
+    return AsyncWebCrawler()
+
+
+def _render_config() -> CrawlerRunConfig:
+    """Config for rendering a page whose markdown may be sent for extraction."""
+    return CrawlerRunConfig(
+        cache_mode=CacheMode.BYPASS,
+        wait_for=_WAIT_FOR_UNITS,
+        wait_for_timeout=int(_JS_LOAD_DELAY * 1000),
+        delay_before_return_html=_JS_SETTLE_DELAY,
+        page_timeout=30000,
+    )
 
 
-async def _find_availability_link(base_url: str) -> str | None:
+async def _find_availability_link(base_url: str, crawler: AsyncWebCrawler):
     """
     Return the URL most likely to contain availability / floor-plan data.
 
     Strategy (in order):
-    1. Try explicit well-known subpage patterns (e.g. /floorplans, /floor-plans).
+    1. If the homepage itself lists units (at least _HOMEPAGE_MIN_LISTING_HITS
+       prices, sizes, bed types or unit numbers), it is the target and the
+       subpage probes are cancelled.
+    2. Try explicit well-known subpage patterns (e.g. /floorplans, /floor-plans).
        Uses Crawl4AI so JS-rendered pages are properly evaluated.
-       Returns on the first hit (HTTP 200 + availability keywords in content).
-    2. Fall back to scoring internal links from the homepage, skipping any
+       The first hit in _EXPLICIT_SUBPAGES order wins (HTTP 200 + availability
+       keywords in content).
+    3. Fall back to scoring internal links from the homepage, skipping any
        URLs that were already probed and didn't contain availability content.
 
-    Returns an absolute URL string, or None if no good match is found.
+    The subpage probes start alongside the homepage fetch, so Pass 1 costs one
+    JS load delay rather than one per probe. Each probe tries plain HTTP
+    first (_http_precheck) and only renders in the browser when that can't
+    decide.
+
+    Returns (url, homepage): url is an absolute URL string, or None if no good
+    match is found; homepage is the rendered homepage result (None if it could
+    not be fetched), so a caller that ends up extracting from base_url can
+    reuse it instead of rendering it again.
     """
     root = _base_url(base_url)
-    probed_urls: set[str] = set()
-
-    # Step 1: Try explicit subpages (handles Entrata /floorplans and similar)
-    config_fast = CrawlerRunConfig(cache_mode=CacheMode.BYPASS)
-    async with AsyncWebCrawler() as crawler:
-        for path in _EXPLICIT_SUBPAGES:
-            candidate = root + path
-            probed_urls.add(candidate)
-            hit = await _probe_subpage(crawler, candidate)
-            if hit:
-                return candidate
-
-        # Step 2: Score internal links from the homepage
-        result = await crawler.arun(base_url, config=config_fast)
+    candidates = [root + path for path in _EXPLICIT_SUBPAGES]
+    probed_urls: set[str] = set(candidates)
+
+    async with httpx.AsyncClient(
+        headers=_HTTP_HEADERS, timeout=_PRECHECK_TIMEOUT, follow_redirects=True
+    ) as http:
+        probes = [
+            asyncio.ensure_future(_probe_candidate(crawler, http, c)) for c in candidates
+        ]
+        try:
+            result = await crawler.arun(base_url, config=_render_config())
+        except asyncio.CancelledError:
+            for probe in probes:
+                probe.cancel()
+            raise
+        except Exception as exc:
+            result = exc
+        homepage = None if isinstance(result, BaseException) else result
+
+        # Step 1: Single-page sites -- the homepage already has the listings
+        if homepage is not None and (
+            len(_LISTING_RE.findall(str(homepage.markdown or ""))) >= _HOMEPAGE_MIN_LISTING_HITS
+        ):
+            for probe in probes:
+                probe.cancel()
+            await asyncio.gather(*probes, return_exceptions=True)
+            return base_url, homepage
+
+        # Step 2: Explicit subpages (handles Entrata /floorplans and similar)
+        hits = await asyncio.gather(*probes, return_exceptions=True)
+
+    for candidate, hit in zip(candidates, hits):
+        if hit is True:
+            return candidate, homepage
+
+    # Step 3: Score internal links from the homepage
+    if homepage is None:
+        raise result
 
     internal_links: list[dict] = []
-    if result.links:
-        internal_links = result.links.get("internal", []) or []
+    if homepage.links:
+        internal_links = homepage.links.get("internal", []) or []
 
     best_href: str | None = None
     best_score = 0
+    # Header, footer and mobile nav repeat the same links; score each pair once
+    seen: set[tuple[str, str]] = set()
 
     for link in internal_links:
         raw_href = (link.get("href") or "").strip()
         text = (link.get("text") or "").strip()
 
-        if not raw_href or raw_href.startswith("#") or raw_href.startswith("mailto:"):
+        if not raw_href or raw_href.startswith(("#", "mailto:")) or (raw_href, text) in seen:
             continue
+        seen.add((raw_href, text))
 
         # Resolve relative URLs against the base
         href = urljoin(base_url, raw_href)
 
         # Skip URLs already probed without availability content
-        if href in probed_urls or href.rstrip("/") in probed_urls:
-            continue
-        # Also skip if the probed path matches (handles trailing slash variants)
-        probed_paths = {_base_url(base_url) + path for path in _EXPLICIT_SUBPAGES}
-        if href in probed_paths:
+        # (probe URLs never end in "/", so this also covers an exact match)
+        if href.rstrip("/") in probed_urls:
             continue
 
         score = _score_link(href, text)
@@ -228,81 +568,349 @@ async def _find_availability_link(base_url: str) -> str | None:
             best_score = score
             best_href = href
 
-    return best_href if best_score > 0 else None
-
-
-async def _scrape_with_llm(url: str) -> list[dict]:
-    """
-    Use Crawl4AI LLMExtractionStrategy to extract unit data from a building URL.
+    return (best_href if best_score > 0 else None), homepage
 
-    Pass 1: try explicit subpages, then score internal links (no LLM cost).
-    Pass 2: crawl the best URL found (or the original URL) with LLM extraction,
-            using a JS load delay so asynchronously-rendered content is present.
 
-    Returns list of raw dicts (matching _UnitRecord schema).
-    Returns empty list on extraction failure or no units found.
-    """
+def _require_api_key() -> str:
+    """Return ANTHROPIC_API_KEY, raising EnvironmentError if it is not set."""
     api_key = os.environ.get("ANTHROPIC_API_KEY")
     if not api_key:
         raise EnvironmentError(
             "ANTHROPIC_API_KEY is not set. "
             "Add it to your .env file or environment before running the LLM scraper."
         )
+    return api_key
 
-    # Pass 1: find the best availability subpage (no LLM cost)
-    target_url = await _find_availability_link(url) or url
 
-    # Pass 2: extract units from the target page.
-    # delay_before_return_html ensures JS-rendered unit listings (Entrata, MRI
-    # React widgets) have loaded before Crawl4AI captures the markdown.
-    strategy = LLMExtractionStrategy(
-        llm_config=LLMConfig(
-            provider=_HAIKU_PROVIDER,
-            api_token=api_key,
-        ),
-        schema=_UnitRecord.model_json_schema(),
-        extraction_type="schema",
-        instruction=_EXTRACTION_INSTRUCTION,
-    )
-    config = CrawlerRunConfig(
-        extraction_strategy=strategy,
-        cache_mode=CacheMode.BYPASS,
-        delay_before_return_html=_JS_LOAD_DELAY,
-        page_timeout=30000,
-    )
+async def _render_target(url: str, crawler: AsyncWebCrawler, refresh: bool = False):
+    """Run Pass 1 link discovery, then render the chosen page.
 
-    async with AsyncWebCrawler() as crawler:
-        result = await crawler.arun(target_url, config=config)
+    Pass 1 results are cached per building URL for _LINK_CACHE_TTL, so warm
+    runs go straight to the render (refresh=True rediscovers regardless). A
+    "no subpage" result is only cached when the homepage rendered, and a
+    cached target that fails to render is forgotten and rediscovered on the
+    next run.
 
-    raw_content = getattr(result, "extracted_content", None) or ""
-    try:
-        parsed = json.loads(raw_content)
-    except (json.JSONDecodeError, TypeError):
-        # Malformed output from LLM -- treat as empty (not a crash)
-        return []
+    Returns (target_url, crawl result). The _WAIT_FOR_UNITS predicate ensures
+    JS-rendered unit listings (Entrata, MRI React widgets) have loaded before
+    Crawl4AI captures the markdown.
+    """
+    hit, link = (False, None) if refresh else _link_cache_get(url)
+    homepage = None
+    if not hit:
+        link, homepage = await _find_availability_link(url, crawler)
+        # "No subpage" is only worth remembering if the homepage actually
+        # rendered -- a transient failure must not pin the building for a week
+        if link is not None or (homepage is not None and homepage.success):
+            _link_cache_put(url, link)
+    target_url = link or url
+
+    # Pass 1 already rendered the homepage the same way -- don't fetch it twice
+    if target_url == url and homepage is not None and homepage.success:
+        return target_url, homepage
+
+    page = await crawler.arun(target_url, config=_render_config())
+    if hit and not page.success:
+        _link_cache_forget(url)
+    return target_url, page
+
+
+def _focus_markdown(markdown: str, window: int = _FOCUS_WINDOW_CHARS) -> str:
+    """
+    Trim page markdown to the region listing units, dropping nav/footer boilerplate.
 
-    if not isinstance(parsed, list):
-        return []
+    Slides a window of at most `window` characters over whole lines and keeps
+    the one with the most _CONTENT_KEYWORDS hits ("$", "bed", "sqft", ...),
+    plus _FOCUS_CONTEXT_LINES lines either side. Pages that already fit, or
+    that contain no keywords at all, are returned unchanged.
+    """
+    if len(markdown) <= window:
+        return markdown
+
+    lines = markdown.splitlines(keepends=True)
+    hits = [len(_CONTENT_RE.findall(line)) for line in lines]
+
+    best_score, best_start, best_end = 0, 0, 0
+    start = size = score = 0
+    for end, line in enumerate(lines):
+        size += len(line)
+        score += hits[end]
+        while size > window and start < end:
+            size -= len(lines[start])
+            score -= hits[start]
+            start += 1
+        if score > best_score:
+            best_score, best_start, best_end = score, start, end + 1
+
+    if not best_score:
+        return markdown
+    lo = max(0, best_start - _FOCUS_CONTEXT_LINES)
+    return "".join(lines[lo:best_end + _FOCUS_CONTEXT_LINES])
+
+
+def _worth_extracting(url: str, markdown: str) -> bool:
+    """True if the page has enough unit content to be worth an LLM call; logs skips."""
+    hits = len(_CONTENT_RE.findall(markdown))
+    if hits < _MIN_EXTRACT_CONTENT_HITS:
+        logger.info("llm_skipped_empty_page %s (%d content hits)", url, hits)
+        return False
+    return True
+
+
+def _parse_units(raw_content: str) -> list[dict] | None:
+    """
+    Decode Claude's JSON output into unit dicts.
+
+    Returns None if the output is not a JSON list at all. Otherwise keeps the
+    records that match the schema and have a real unit, bed type and rent.
+    """
+    try:
+        items = _ITEMS_DECODER.decode(raw_content)
+    except msgspec.DecodeError:
+        return None
 
-    # Filter to records with the minimum required fields and a real rent value
     units = []
-    for item in parsed:
-        if not isinstance(item, dict):
+    for raw_item in items:
+        try:
+            item = _UNIT_DECODER.decode(raw_item)
+        except msgspec.ValidationError:
             continue
-        unit_number = (item.get("unit_number") or "").strip()
-        bed_type = (item.get("bed_type") or "").strip()
-        rent = (item.get("rent") or "").strip()
 
-        if not unit_number or not bed_type:
+        if not item.unit_number.strip() or not item.bed_type.strip():
             continue
-        if rent.lower() in _RENT_PLACEHOLDER_VALUES:
+        if item.rent.strip().lower() in _RENT_PLACEHOLDER_VALUES:
             continue
 
-        units.append(item)
+        units.append(msgspec.to_builtins(item))
 
     return units
 
 
+def _extraction_params(markdown: str) -> dict:
+    """Messages API parameters for extracting units from one page's markdown."""
+    return {
+        "model": _HAIKU_MODEL,
+        "max_tokens": _MAX_TOKENS,
+        "system": _SYSTEM_BLOCKS,
+        "messages": [
+            {"role": "user", "content": markdown},
+            {"role": "assistant", "content": "["},
+        ],
+    }
+
+
+def _reply_json(message) -> str:
+    """Rejoin the prefilled "[" with the text of Claude's reply."""
+    return "[" + "".join(block.text for block in message.content if block.type == "text")
+
+
+async def _scrape_with_llm(url: str, crawler: AsyncWebCrawler | None = None) -> list[dict]:
+    """
+    Extract unit data from a building URL with Crawl4AI and Claude Haiku.
+
+    Pass 1: try explicit subpages, then score internal links (no LLM cost).
+    Pass 2: render the best URL found (or the original URL) with a JS load
+            delay so asynchronously-rendered content is present, then send its
+            markdown to Claude Haiku.
+
+    Both passes share one browser: the given crawler, or a fresh one launched
+    for this call.
+
+    Returns list of raw dicts (matching _UnitRecord schema).
+    Returns empty list on extraction failure or no units found.
+    """
+    api_key = _require_api_key()
+
+    async with _crawler_scope(crawler) as shared:
+        target_url, page = await _render_target(url, shared)
+
+    markdown = _focus_markdown(str(page.markdown or ""))
+    if not _worth_extracting(target_url, markdown):
+        return []
+    digest = hashlib.sha256(markdown.encode()).hexdigest()
+
+    # Unchanged page since the last run -- reuse that extraction, skip the LLM
+    raw_content = _cache_get(target_url, digest)
+    cache_hit = raw_content is not None
+    if not cache_hit:
+        async with AsyncAnthropic(api_key=api_key) as client:
+            message = await client.messages.create(**_extraction_params(markdown))
+        raw_content = _reply_json(message)
+
+    units = _parse_units(raw_content)
+    if units is None:
+        # Malformed or non-list output from LLM -- treat as empty (not a crash)
+        return []
+
+    if not cache_hit:
+        _cache_put(target_url, digest, raw_content)
+
+    return units
+
+
+async def _extract_direct(client, pages: dict[str, str]) -> dict[str, str | BaseException]:
+    """Extract pages with individual Messages calls; same result shape as _extract_batch()."""
+    sem = asyncio.Semaphore(_DIRECT_FALLBACK_CONCURRENCY)
+
+    async def _one(markdown: str) -> str | BaseException:
+        async with sem:
+            try:
+                return _reply_json(await client.messages.create(**_extraction_params(markdown)))
+            except Exception as exc:
+                return exc
+
+    results = await asyncio.gather(*(_one(markdown) for markdown in pages.values()))
+    return dict(zip(pages, results))
+
+
+async def _extract_batch(api_key: str, pages: dict[str, str]) -> dict[str, str | BaseException]:
+    """
+    Extract units from several pages with one Message Batches request.
+
+    pages maps a custom_id to page markdown. Polls every _BATCH_POLL_SECONDS
+    until the batch has ended, then returns custom_id -> raw JSON text, or an
+    LLMScraperError for requests that errored, expired or were canceled.
+
+    A batch still running after _BATCH_MAX_WAIT_SECONDS is canceled and every
+    page is extracted with a direct Messages call instead.
+    """
+    async with AsyncAnthropic(api_key=api_key) as client:
+        batch = await client.messages.batches.create(requests=[
+            {"custom_id": custom_id, "params": _extraction_params(markdown)}
+            for custom_id, markdown in pages.items()
+        ])
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + _BATCH_MAX_WAIT_SECONDS
+        while batch.processing_status != "ended":
+            if loop.time() >= deadline:
+                logger.warning(
+                    "llm_batch_timeout %s (%d requests) -- canceling, extracting directly",
+                    batch.id, len(pages),
+                )
+                try:
+                    await client.messages.batches.cancel(batch.id)
+                except Exception as exc:
+                    logger.warning("llm_batch_cancel_failed %s: %s", batch.id, exc)
+                return await _extract_direct(client, pages)
+            await asyncio.sleep(_BATCH_POLL_SECONDS)
+            batch = await client.messages.batches.retrieve(batch.id)
+
+        extracted: dict[str, str | BaseException] = {
+            custom_id: LLMScraperError(f"batch {batch.id} returned no result")
+            for custom_id in pages
+        }
+        async for entry in await client.messages.batches.results(batch.id):
+            if entry.result.type != "succeeded":
+                extracted[entry.custom_id] = LLMScraperError(
+                    f"batch {batch.id} request {entry.custom_id}: {entry.result.type}"
+                )
+                continue
+            extracted[entry.custom_id] = _reply_json(entry.result.message)
+    return extracted
+
+
+async def scrape_many(
+    buildings: list[Building],
+    concurrency: int = _SCRAPE_MANY_CONCURRENCY,
+    *,
+    force_refresh: bool = False,
+    delay: float = 0.0,
+    on_outcome: Callable[[int, list[dict] | BaseException], None] | None = None,
+) -> dict[int, list[dict] | BaseException]:
+    """
+    Scrape several buildings with one browser and one Message Batches request.
+
+    Pages are rendered concurrently (at most `concurrency` at once) on a
+    shared crawler, each render slot held for a further `delay` seconds as
+    a politeness pause. Pages whose markdown is unchanged since the last run
+    reuse the cached extraction; the rest go to Claude Haiku together as a
+    single batch, which Anthropic bills at half the per-request price.
+    force_refresh=True ignores both the Pass 1 link cache and the extraction
+    cache (fresh results are still written back).
+
+    on_outcome(building_id, outcome), if given, is called as soon as each
+    building's outcome is known -- right after its render for failed, empty
+    or cached pages, or once the batch ends for the rest -- so callers can
+    save results without waiting for the whole batch.
+
+    Returns a dict mapping building.id to either the raw unit list (as scrape()
+    would return it) or the exception that building's scrape raised -- one
+    failing building never aborts the others.
+    """
+    outcomes: dict[int, list[dict] | BaseException] = {}
+
+    def _settle(building: Building, outcome: list[dict] | BaseException) -> None:
+        outcomes[building.id] = outcome
+        if on_outcome is not None:
+            on_outcome(building.id, outcome)
+
+    try:
+        api_key = _require_api_key()
+    except EnvironmentError as exc:
+        for building in buildings:
+            _settle(building, exc)
+        return outcomes
+
+    sem = asyncio.Semaphore(concurrency)
+    pending: dict[str, tuple[Building, str, str, str]] = {}
+
+    def _triage(building: Building, render) -> None:
+        """Settle a rendered building now, or queue its page for the batch."""
+        if isinstance(render, BaseException):
+            _settle(building, render)
+            return
+        target_url, page = render
+        markdown = _focus_markdown(str(page.markdown or ""))
+        if not _worth_extracting(target_url, markdown):
+            _settle(building, [])
+            return
+        digest = hashlib.sha256(markdown.encode()).hexdigest()
+        cached = None if force_refresh else _cache_get(target_url, digest)
+        if cached is not None:
+            _settle(building, _parse_units(cached) or [])
+            return
+        pending[str(building.id)] = (building, target_url, digest, markdown)
+
+    async with AsyncWebCrawler() as crawler:
+        async def _render(building: Building):
+            # A failing building is recorded, not raised, so the TaskGroup only
+            # tears the others down on cancellation (e.g. Ctrl-C / shutdown)
+            async with sem:
+                try:
+                    render = await _render_target(building.url, crawler, force_refresh)
+                except Exception as exc:
+                    render = exc
+                _triage(building, render)
+                if delay:
+                    await asyncio.sleep(delay)
+
+        async with asyncio.TaskGroup() as tg:
+            for building in buildings:
+                tg.create_task(_render(building))
+
+    if pending:
+        try:
+            extracted = await _extract_batch(
+                api_key, {cid: markdown for cid, (_, _, _, markdown) in pending.items()}
+            )
+        except Exception as exc:
+            extracted = {cid: exc for cid in pending}
+
+        for cid, (building, target_url, digest, _) in pending.items():
+            raw_content = extracted[cid]
+            if isinstance(raw_content, BaseException):
+                _settle(building, raw_content)
+                continue
+            units = _parse_units(raw_content)
+            if units is None:
+                _settle(building, [])
+                continue
+            _cache_put(target_url, digest, raw_content)
+            _settle(building, units)
+
+    return {b.id: outcomes[b.id] for b in buildings}
+
+
 def scrape(building: Building) -> list[dict]:
     """
     Scrape unit availability using LLM extraction (Crawl4AI + Claude Haiku).
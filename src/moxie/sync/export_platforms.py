@@ -10,9 +10,11 @@ Usage:
 Behavior:
 - Reads every building from the DB (url → platform).
 - Opens the configured Google Sheet tab.
-- Adds a "Platform" header in the next available column if the column doesn't exist.
+- Adds a "Platform" header in a new column after the sheet's last column if the
+  column doesn't exist.
 - Writes the DB platform value (or "needs_classification" if null) next to each row
-  matched by URL. Overwrites any existing values in the Platform column.
+  matched by URL, overwriting that cell. Cells of unmatched rows are never written,
+  so concurrent edits and formulas there are left alone.
 - Rows with no Website URL are skipped (nothing to match on).
 
 After this runs:
@@ -27,9 +29,10 @@ import gspread
 import gspread.utils
 from sqlalchemy.orm import Session
 
-from moxie.config import GOOGLE_SHEETS_ID, GOOGLE_SHEETS_KEY_PATH, GOOGLE_SHEETS_TAB_NAME
+from moxie.config import GOOGLE_SHEETS_TAB_NAME
 from moxie.db.models import Building
 from moxie.db.session import get_db
+from moxie.sync.sheets import open_spreadsheet
 
 
 def export_platforms(db: Session) -> dict:
@@ -42,16 +45,13 @@ def export_platforms(db: Session) -> dict:
         ValueError: if the sheet is empty or has no Website column.
     """
     # 1. Authenticate and open sheet
-    gc = gspread.service_account(filename=GOOGLE_SHEETS_KEY_PATH)
-    sh = gc.open_by_key(GOOGLE_SHEETS_ID)
+    sh = open_spreadsheet()
     worksheet = sh.worksheet(GOOGLE_SHEETS_TAB_NAME)
 
-    raw = worksheet.get_all_values()
-    if not raw:
+    headers = [h.strip() for h in worksheet.row_values(1)]
+    if not headers:
         raise ValueError("Sheet is empty — nothing to export to.")
 
-    headers = [h.strip() for h in raw[0]]
-
     if "Website" not in headers:
         raise ValueError(
             f"'Website' column not found in sheet tab '{GOOGLE_SHEETS_TAB_NAME}'. "
@@ -63,40 +63,61 @@ def export_platforms(db: Session) -> dict:
     if "Platform" in headers:
         platform_col = headers.index("Platform")
     else:
-        # Append as the next column after existing headers
-        platform_col = len(headers)
+        # Append past the grid's last column: row_values(1) trims trailing blank
+        # header cells, and an unlabeled column there may still hold data
+        platform_col = worksheet.col_count
+        worksheet.add_cols(1)
         worksheet.update_cell(1, platform_col + 1, "Platform")
 
+    # Only the Website column is read; Platform cells are written, never read
+    url_letter = _col_letter(url_col)
+    platform_letter = _col_letter(platform_col)
+    (url_values,) = worksheet.batch_get([f"{url_letter}2:{url_letter}"])
+
     # 3. Build URL → platform map from DB
+    # Column query: plain (url, platform) rows, no Building instances
     url_to_platform: dict[str, str] = {
-        b.url: (b.platform or "needs_classification")
-        for b in db.query(Building).all()
-        if b.url
+        url: (platform or "needs_classification")
+        for url, platform in db.query(Building.url, Building.platform)
+        if url
     }
 
-    # 4. Build batch updates (one cell per data row with a matching URL)
-    updates: list[dict] = []
+    # 4. Group matched rows into contiguous runs, one range each. Rows with no
+    # matching URL are left out entirely, so their cells are never touched.
+    sheet_urls = [cell[0].strip() if cell else "" for cell in url_values]
+    runs: list[tuple[int, list[str]]] = []  # (first sheet row, values)
+    written = 0
     skipped = 0
 
-    for sheet_row_idx, row in enumerate(raw[1:], start=2):  # 1-indexed; row 1 is header
-        url = row[url_col].strip() if url_col < len(row) else ""
-        if not url:
-            skipped += 1
-            continue
-
-        platform_value = url_to_platform.get(url)
+    for i, url in enumerate(sheet_urls):
+        platform_value = url_to_platform.get(url) if url else None
         if platform_value is None:
-            # URL is in sheet but not in DB — skip rather than guess
+            # No URL, or URL is in sheet but not in DB — skip rather than guess
             skipped += 1
             continue
 
-        cell_a1 = gspread.utils.rowcol_to_a1(sheet_row_idx, platform_col + 1)
-        updates.append({"range": cell_a1, "values": [[platform_value]]})
+        row_num = i + 2  # 1-indexed, skip header row
+        if runs and runs[-1][0] + len(runs[-1][1]) == row_num:
+            runs[-1][1].append(platform_value)
+        else:
+            runs.append((row_num, [platform_value]))
+        written += 1
+
+    if runs:
+        worksheet.batch_update([
+            {
+                "range": f"{platform_letter}{start}:{platform_letter}{start + len(values) - 1}",
+                "values": [[v] for v in values],
+            }
+            for start, values in runs
+        ])
+
+    return {"written": written, "skipped": skipped}
 
-    if updates:
-        worksheet.batch_update(updates)
 
-    return {"written": len(updates), "skipped": skipped}
+def _col_letter(col: int) -> str:
+    """Return the A1 column letter for a 0-indexed column (0 → 'A', 26 → 'AA')."""
+    return gspread.utils.rowcol_to_a1(1, col + 1)[:-1]
 
 
 def main() -> None:
@@ -10,28 +10,47 @@ Entrypoint: moxie.sync.push_availability:main (registered as `validate-building`
 """
 
 import argparse
+import functools
 import importlib
 import sys
+from datetime import datetime
 
-import gspread
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 
-from moxie.config import GOOGLE_SHEETS_ID, GOOGLE_SHEETS_KEY_PATH
 from moxie.db.models import Building, Unit
-from moxie.db.session import get_db
-from moxie.scrapers.base import save_scrape_result
-from moxie.scrapers.platform_detect import detect_platform
 from moxie.scrapers.registry import PLATFORM_SCRAPERS
 
+# gspread, the DB session and the scraper helpers are imported where they are
+# used, so `validate-building --help` and argument errors return without
+# loading the Google auth stack or the scraper/normalizer chain.
 
+
+@functools.lru_cache(maxsize=4096)
 def _format_rent(rent_cents: int) -> str:
-    """Format rent in cents as a dollar string (e.g., 150000 -> '$1,500')."""
+    """Format rent in cents as a dollar string (e.g., 150000 -> '$1,500').
+
+    Memoized: many units share the same rent, so most calls are cache hits.
+    """
     if rent_cents == 0:
         return "N/A"
     dollars = rent_cents / 100
     return f"${dollars:,.0f}"
 
 
+@functools.lru_cache(maxsize=1024)
+def _format_scraped_at(scrape_run_at: datetime | None) -> str:
+    """Format a scrape timestamp as '2026-03-01 08:30 UTC' ('' if missing).
+
+    Builds the string from attributes rather than strftime, and is memoized
+    since every unit from one scrape run shares the same timestamp.
+    """
+    if not scrape_run_at:
+        return ""
+    dt = scrape_run_at
+    return f"{dt.year:04}-{dt.month:02}-{dt.day:02} {dt.hour:02}:{dt.minute:02} UTC"
+
+
 def push_availability(db: Session, building_ids: list[int] | None = None) -> int:
     """
     Push unit availability data from the DB to a Google Sheets "Availability" tab.
@@ -46,35 +65,51 @@ def push_availability(db: Session, building_ids: list[int] | None = None) -> int
     Returns:
         Number of data rows written (excluding header).
     """
-    # 1. Query units joined with buildings
-    query = db.query(Unit, Building).join(Building, Unit.building_id == Building.id)
+    # 1. Query just the pushed columns (plain row tuples, no ORM objects),
+    #    sorted by building name then unit number in SQL
+    query = (
+        db.query(
+            Building.name, Building.neighborhood, Unit.unit_number, Unit.bed_type,
+            Unit.rent_cents, Unit.availability_date, Unit.floor_plan_name, Unit.baths,
+            Unit.sqft, Building.management_company, Unit.scrape_run_at, Building.url,
+        )
+        .join(Building, Unit.building_id == Building.id)
+        .order_by(func.lower(Building.name), Unit.unit_number)
+    )
     if building_ids is not None:
         query = query.filter(Building.id.in_(building_ids))
-    results = query.all()
-
-    # 2. Build rows sorted by building name then unit number
-    rows = []
-    for unit, building in results:
-        rows.append({
-            "building_name": building.name or "",
-            "neighborhood": building.neighborhood or "",
-            "unit_number": unit.unit_number or "",
-            "beds": unit.bed_type or "",
-            "rent": _format_rent(unit.rent_cents),
-            "available_date": unit.availability_date or "",
-            "floor_plan": unit.floor_plan_name or "",
-            "baths": unit.baths or "",
-            "sqft": str(unit.sqft) if unit.sqft else "",
-            "management_company": building.management_company or "",
-            "scraped_at": unit.scrape_run_at.strftime("%Y-%m-%d %H:%M UTC") if unit.scrape_run_at else "",
-            "url": building.url or "",
-        })
-
-    rows.sort(key=lambda r: (r["building_name"].lower(), r["unit_number"]))
+
+    # 2. Format each row in sheet column order, streaming the result in
+    #    chunks rather than buffering the whole join first. The formatters are
+    #    bound to locals so the per-row calls skip global lookups.
+    format_rent, format_scraped_at = _format_rent, _format_scraped_at
+    data_rows = [
+        [
+            name or "",
+            neighborhood or "",
+            unit_number or "",
+            bed_type or "",
+            format_rent(rent_cents),
+            availability_date or "",
+            floor_plan_name or "",
+            baths or "",
+            str(sqft) if sqft else "",
+            management_company or "",
+            format_scraped_at(scrape_run_at),
+            url or "",
+        ]
+        for (
+            name, neighborhood, unit_number, bed_type, rent_cents, availability_date,
+            floor_plan_name, baths, sqft, management_company, scrape_run_at, url,
+        ) in query.yield_per(1000)
+    ]
 
     # 3. Authenticate to Google Sheets
-    gc = gspread.service_account(filename=GOOGLE_SHEETS_KEY_PATH)
-    sh = gc.open_by_key(GOOGLE_SHEETS_ID)
+    import gspread
+    import gspread.utils
+    from moxie.sync.sheets import open_spreadsheet
+
+    sh = open_spreadsheet()
 
     # 4. Create or get the "Availability" worksheet
     try:
@@ -91,27 +126,11 @@ def push_availability(db: Session, building_ids: list[int] | None = None) -> int
         "Management Company", "Scraped At", "URL",
     ]
 
-    data_rows = []
-    for r in rows:
-        data_rows.append([
-            r["building_name"],
-            r["neighborhood"],
-            r["unit_number"],
-            r["beds"],
-            r["rent"],
-            r["available_date"],
-            r["floor_plan"],
-            r["baths"],
-            r["sqft"],
-            r["management_company"],
-            r["scraped_at"],
-            r["url"],
-        ])
-
-    # Write header + data in one batch
+    # clear() keeps the grid (frozen header row, formatting) and only empties
+    # values; the explicit range sends header + data as one values update
     all_rows = [header] + data_rows
-    if all_rows:
-        ws.update(all_rows, value_input_option="RAW")
+    last_cell = gspread.utils.rowcol_to_a1(len(all_rows), len(header))
+    ws.update(values=all_rows, range_name=f"A1:{last_cell}", value_input_option="RAW")
 
     return len(data_rows)
 
@@ -183,6 +202,10 @@ def main() -> None:
     )
     args = parser.parse_args()
 
+    from moxie.db.session import get_db
+    from moxie.scrapers.base import save_scrape_result
+    from moxie.scrapers.platform_detect import detect_platform
+
     # --no-save overrides --save
     save = args.save and not args.no_save
 
@@ -21,12 +21,16 @@ Alex correct wrong platform assignments directly in the sheet.
 Entrypoint: moxie.sync.sheets:main (registered as `sheets-sync` in pyproject.toml)
 """
 
+import functools
+import sys
+
 from moxie.config import GOOGLE_SHEETS_ID, GOOGLE_SHEETS_KEY_PATH, GOOGLE_SHEETS_TAB_NAME
-from moxie.db.models import Building
+from moxie.db.models import Building, ScrapeRun, Unit
 from moxie.db.session import get_db
 from moxie.scrapers.platform_detect import detect_platform
 
 import gspread
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 
 
@@ -49,16 +53,19 @@ def _parse_rows(raw: list[list]) -> list[dict]:
     # Map header text → column index, ignoring blank headers
     col = {h.strip(): i for i, h in enumerate(headers) if h.strip()}
 
-    def cell(row: list, key: str) -> str:
-        idx = col.get(key)
-        if idx is None or idx >= len(row):
-            return ""
-        return str(row[idx]).strip()
+    # Resolve the five used columns once; a missing column gets an index past
+    # any row's end, so it reads as "" through the same bounds check
+    missing = sys.maxsize
+    i_name, i_url, i_nbhd, i_mgmt, i_plat = (
+        col.get(key, missing)
+        for key in ("Building Name", "Website", "Neighborhood", "Managment", "Platform")
+    )
 
     buildings = []
     for row in raw[1:]:
-        name = cell(row, "Building Name")
-        url = cell(row, "Website")
+        n = len(row)
+        name = row[i_name].strip() if i_name < n else ""
+        url = row[i_url].strip() if i_url < n else ""
 
         if not name and not url:
             continue  # blank row
@@ -66,14 +73,27 @@ def _parse_rows(raw: list[list]) -> list[dict]:
         buildings.append({
             "name": name,
             "url": url,
-            "neighborhood": cell(row, "Neighborhood") or None,
-            "management_company": cell(row, "Managment") or None,  # sheet typo
-            "platform": cell(row, "Platform") or "",  # "" if column absent or blank
+            "neighborhood": (row[i_nbhd].strip() if i_nbhd < n else "") or None,
+            "management_company": (row[i_mgmt].strip() if i_mgmt < n else "") or None,  # sheet typo
+            "platform": row[i_plat].strip() if i_plat < n else "",  # "" if column absent or blank
         })
 
     return buildings
 
 
+@functools.lru_cache(maxsize=1)
+def open_spreadsheet() -> gspread.Spreadsheet:
+    """
+    Authenticate with the service account and open the configured spreadsheet.
+
+    Memoized: one batch run (building sync, status push, availability push)
+    reuses a single authorized client instead of re-reading the key file and
+    redoing the OAuth token exchange for every push.
+    """
+    gc = gspread.service_account(filename=GOOGLE_SHEETS_KEY_PATH)
+    return gc.open_by_key(GOOGLE_SHEETS_ID)
+
+
 def sheets_sync(db: Session) -> dict:
     """
     Pull all rows from the configured tab and upsert them into the buildings table.
@@ -97,11 +117,8 @@ def sheets_sync(db: Session) -> dict:
         ValueError: if no buildings with a URL are found (wrong tab name,
                     sheet not shared, or Website column missing).
     """
-    # 1. Authenticate using service account key file
-    gc = gspread.service_account(filename=GOOGLE_SHEETS_KEY_PATH)
-
-    # 2. Open sheet by ID
-    sh = gc.open_by_key(GOOGLE_SHEETS_ID)
+    # 1-2. Authenticate and open the sheet by ID (client is shared per process)
+    sh = open_spreadsheet()
 
     # 3. Get the configured tab (case-sensitive)
     worksheet = sh.worksheet(GOOGLE_SHEETS_TAB_NAME)
@@ -110,60 +127,97 @@ def sheets_sync(db: Session) -> dict:
     raw = worksheet.get_all_values()
     buildings = _parse_rows(raw)
 
-    # 5. Guard: need at least one building with a URL to do anything useful
-    syncable = [b for b in buildings if b["url"]]
+    # 5. Split rows with a URL (upserted; their URLs drive deletion detection)
+    #    from those without (skipped: no unique key), in one pass
+    added = updated = deleted = skipped = 0
+    syncable = []
+    sheet_urls = set()
+    for b in buildings:
+        if b["url"]:
+            syncable.append(b)
+            sheet_urls.add(b["url"])
+        else:
+            skipped += 1
+
+    # 6. Guard: need at least one building with a URL to do anything useful
     if not syncable:
         raise ValueError(
             f"Sheets sync found no buildings with a URL in tab '{GOOGLE_SHEETS_TAB_NAME}'. "
             "Check that column A has building names and the 'Website' column has URLs."
         )
 
-    # 6. Build set of all sheet URLs for deletion detection
-    sheet_urls = {b["url"] for b in syncable}
-
-    added = updated = deleted = skipped = 0
-
-    # 7. Upsert each building that has a URL; skip those without
-    for b in buildings:
-        if not b["url"]:
-            skipped += 1
-            continue
-
-        existing = db.query(Building).filter_by(url=b["url"]).first()
+    # 7. Upsert each building that has a URL.
+    #    One SELECT loads every DB building up front -- it serves both the
+    #    per-row upsert lookups here and the deletion pass in step 8.
+    db_buildings = db.query(Building).all()
+    by_url = {building.url: building for building in db_buildings}
+    # New buildings are plain column dicts, inserted in one bulk statement below
+    new_rows: dict[str, dict] = {}
+    for b in syncable:
+        existing = by_url.get(b["url"])
         if existing:
-            existing.name = b["name"]
-            existing.neighborhood = b["neighborhood"]
-            existing.management_company = b["management_company"]
-            if b["platform"]:  # sheet wins: non-blank value overrides DB
+            # Assign only on change so unchanged rows never enter session.dirty
+            # and flush has nothing to diff for them
+            if existing.name != b["name"]:
+                existing.name = b["name"]
+            if existing.neighborhood != b["neighborhood"]:
+                existing.neighborhood = b["neighborhood"]
+            if existing.management_company != b["management_company"]:
+                existing.management_company = b["management_company"]
+            # sheet wins: non-blank value overrides DB
+            if b["platform"] and existing.platform != b["platform"]:
                 existing.platform = b["platform"]
             updated += 1
-        else:
-            db.add(Building(
+        elif b["url"] in new_rows:
+            # A repeated sheet row updates the pending insert, not re-adds it
+            row = new_rows[b["url"]]
+            row.update(
                 name=b["name"],
-                url=b["url"],
                 neighborhood=b["neighborhood"],
                 management_company=b["management_company"],
-                platform=b["platform"] or None,
-                last_scrape_status="never",
-            ))
+            )
+            if b["platform"]:
+                row["platform"] = b["platform"]
+            updated += 1
+        else:
+            new_rows[b["url"]] = {
+                "name": b["name"],
+                "url": b["url"],
+                "neighborhood": b["neighborhood"],
+                "management_company": b["management_company"],
+                "platform": b["platform"] or None,
+                "last_scrape_status": "never",
+            }
             added += 1
+    if new_rows:
+        db.execute(insert(Building), list(new_rows.values()))
 
     # 7b. Platform detection: classify any building that still has no platform value.
-    #     Flush first so that newly-added buildings from step 7 are visible in the
-    #     query below (matters when the session has autoflush=False).
+    #     Flush first so that step 7's updates (e.g. a sheet-set platform) are
+    #     visible in the query below (matters when the session has autoflush=False).
     #     Runs on ALL buildings in the DB (not just ones just upserted) so that
     #     buildings from a previous sync pass also get classified.
     #     "Fills blanks only" — existing non-null platform values are never changed.
+    #     Only (id, url) is loaded; each detected platform is one bulk UPDATE.
     db.flush()
-    for building in db.query(Building).filter(Building.platform.is_(None)).all():
-        detected = detect_platform(building.url or "")
-        building.platform = detected if detected is not None else "needs_classification"
-
-    # 8. Delete DB buildings whose URL is no longer in the sheet
-    for building in db.query(Building).all():
-        if building.url not in sheet_urls:
-            db.delete(building)
-            deleted += 1
+    ids_by_platform: dict[str, list[int]] = {}
+    unclassified = db.query(Building.id, Building.url).filter(Building.platform.is_(None))
+    for building_id, url in unclassified:
+        detected = detect_platform(url or "") or "needs_classification"
+        ids_by_platform.setdefault(detected, []).append(building_id)
+    for platform, ids in ids_by_platform.items():
+        db.query(Building).filter(Building.id.in_(ids)).update({"platform": platform})
+
+    # 8. Delete DB buildings whose URL is no longer in the sheet, with bulk DELETEs.
+    #    Bulk deletes skip the ORM delete-orphan cascade (and SQLite does not
+    #    enforce foreign keys), so their units and scrape runs are removed first.
+    stale_ids = [building.id for building in db_buildings if building.url not in sheet_urls]
+    if stale_ids:
+        for child in (Unit, ScrapeRun):
+            db.query(child).filter(child.building_id.in_(stale_ids)).delete(
+                synchronize_session=False
+            )
+        deleted = db.query(Building).filter(Building.id.in_(stale_ids)).delete()
 
     # 9. Commit all changes
     db.commit()
@@ -1,33 +1,28 @@
 """
 Shared fixtures for API integration tests.
 
-Uses in-memory SQLite with StaticPool for clean per-test DB isolation.
+Uses the in-memory SQLite `_engine` from tests/conftest.py. The schema is
+created once per test session; each test runs inside a transaction that is
+rolled back afterwards, so tests stay isolated without re-running
+CREATE/DROP TABLE every time.
 The real get_db dependency is overridden via app.dependency_overrides.
+
+Safe under pytest-xdist (`pytest -n auto`): every worker is its own process,
+so each gets its own in-memory database, seeded users and TestClient.
 """
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
+from pwdlib import PasswordHash
+from pwdlib.hashers.argon2 import Argon2Hasher
+from sqlalchemy.orm import Session
 
+import moxie.api.auth
 from moxie.api.main import app
-from moxie.api.auth import hash_password
-from moxie.db.models import Base, User
+from moxie.api.auth import create_access_token, hash_password
+from moxie.db.models import User
 from moxie.db.session import get_db
 
 
-# ---------------------------------------------------------------------------
-# Core DB engine and session factory (shared across the module, isolated per test)
-# ---------------------------------------------------------------------------
-
-def _make_engine():
-    return create_engine(
-        "sqlite://",
-        connect_args={"check_same_thread": False},
-        poolclass=StaticPool,
-    )
-
-
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
@@ -53,35 +48,65 @@ def create_test_user(
     return user
 
 
-def get_auth_header(client: TestClient, email: str, password: str) -> dict:
-    """Log in via POST /auth/login and return Authorization header dict."""
-    resp = client.post("/auth/login", json={"email": email, "password": password})
-    assert resp.status_code == 200, f"Login failed: {resp.json()}"
-    token = resp.json()["access_token"]
-    return {"Authorization": f"Bearer {token}"}
+def get_auth_header(user: User) -> dict:
+    """Mint a token for user directly and return Authorization header dict.
+
+    Skips the POST /auth/login round-trip (password verify + ASGI stack);
+    TestLogin covers the endpoint itself.
+    """
+    return {"Authorization": f"Bearer {create_access_token(user.id)}"}
 
 
 # ---------------------------------------------------------------------------
 # Fixtures
 # ---------------------------------------------------------------------------
 
+@pytest.fixture(scope="session", autouse=True)
+def _fast_password_hashing():
+    """Swap in minimum-cost Argon2 so seeding users and logging in stay cheap.
+
+    Hashes are still real Argon2 and go through the real hash/verify code;
+    only the work factors (time, memory, lanes) are turned down.
+    """
+    fast = PasswordHash((Argon2Hasher(time_cost=1, memory_cost=8, parallelism=1),))
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(moxie.api.auth, "password_hasher", fast)
+        yield
+
+
 @pytest.fixture()
-def db_session():
-    """Yield a TestingSession backed by in-memory SQLite. Clean per test."""
-    engine = _make_engine()
-    Base.metadata.create_all(engine)
-    TestingSession = sessionmaker(bind=engine, autocommit=False, autoflush=False)
-    session = TestingSession()
+def db_session(_engine, _seeded_users):
+    """Yield a Session inside a transaction that is rolled back after the test.
+
+    Commits made by the test (or the API under test) only release a SAVEPOINT,
+    so nothing outlives the test. The seeded admin and agent users are always
+    present, whichever test runs first.
+    """
+    connection = _engine.connect()
+    transaction = connection.begin()
+    session = Session(
+        bind=connection,
+        autoflush=False,
+        join_transaction_mode="create_savepoint",
+    )
 
     yield session
 
     session.close()
-    Base.metadata.drop_all(engine)
+    transaction.rollback()
+    connection.close()
+
+
+@pytest.fixture(scope="session")
+def _test_client():
+    """One TestClient (and app startup) shared by the whole run."""
+    with TestClient(app) as test_client:
+        yield test_client
 
 
 @pytest.fixture()
-def client(db_session):
-    """Yield a FastAPI TestClient with get_db overridden to use the test DB session."""
+def client(_test_client, db_session):
+    """Yield the shared TestClient with get_db overridden to use this test's DB session."""
     def override_get_db():
         try:
             yield db_session
@@ -89,32 +114,49 @@ def client(db_session):
             pass  # session lifecycle managed by db_session fixture
 
     app.dependency_overrides[get_db] = override_get_db
+    _test_client.cookies.clear()
 
-    with TestClient(app) as test_client:
-        yield test_client
+    yield _test_client
+
+    app.dependency_overrides.pop(get_db, None)
+
+
+@pytest.fixture(scope="session")
+def _seeded_users(_engine):
+    """Insert the admin and agent users once, committed, and mint their tokens.
 
-    app.dependency_overrides.clear()
+    Every test sees both rows; a test that changes them (e.g. deactivates the
+    agent) does so inside its own rolled-back transaction.
+    Returns {"admin": (user_id, headers), "agent": (user_id, headers)}.
+    """
+    with Session(_engine) as session:
+        admin = create_test_user(session, "admin@test.com", "adminpass123", role="admin")
+        agent = create_test_user(session, "agent@test.com", "agentpass123", role="agent")
+        return {
+            role: (user.id, get_auth_header(user))
+            for role, user in (("admin", admin), ("agent", agent))
+        }
 
 
 @pytest.fixture()
-def admin_user(db_session):
-    """Create and return an active admin user."""
-    return create_test_user(db_session, "admin@test.com", "adminpass123", role="admin")
+def admin_user(db_session, _seeded_users):
+    """Return the active admin user, loaded in this test's session."""
+    return db_session.get(User, _seeded_users["admin"][0])
 
 
 @pytest.fixture()
-def admin_headers(client, admin_user):
+def admin_headers(client, _seeded_users):
     """Return Authorization headers for the admin user."""
-    return get_auth_header(client, "admin@test.com", "adminpass123")
+    return _seeded_users["admin"][1]
 
 
 @pytest.fixture()
-def agent_user(db_session):
-    """Create and return an active agent user."""
-    return create_test_user(db_session, "agent@test.com", "agentpass123", role="agent")
+def agent_user(db_session, _seeded_users):
+    """Return the active agent user, loaded in this test's session."""
+    return db_session.get(User, _seeded_users["agent"][0])
 
 
 @pytest.fixture()
-def agent_headers(client, agent_user):
+def agent_headers(client, _seeded_users):
     """Return Authorization headers for the agent user."""
-    return get_auth_header(client, "agent@test.com", "agentpass123")
+    return _seeded_users["agent"][1]
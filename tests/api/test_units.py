@@ -6,7 +6,9 @@ Covers:
 - POST /admin/rescrape/{building_id} (ADMIN-04): trigger, poll, 409 duplicate, 404, role check
 """
 from datetime import datetime, timezone
-from unittest.mock import patch
+
+import pytest
+from sqlalchemy import insert
 
 from moxie.db.models import Building, Unit
 import moxie.api.routers.admin as admin_router_module
@@ -39,27 +41,47 @@ def seed_building_with_units(
     db.add(building)
     db.flush()  # get building.id without committing
 
+    # Units are plain column dicts inserted in one Core executemany (no Unit
+    # instances, no unit of work); an empty list would mean a single bare INSERT
     now = datetime.now(timezone.utc)
-    for u in units_data:
-        unit = Unit(
-            building_id=building.id,
-            unit_number=u["unit_number"],
-            bed_type=u["bed_type"],
-            rent_cents=u["rent_cents"],
-            availability_date=u["availability_date"],
-            floor_plan_name=u.get("floor_plan_name"),
-            baths=u.get("baths"),
-            sqft=u.get("sqft"),
-            non_canonical=u.get("non_canonical", False),
-            scrape_run_at=now,
-        )
-        db.add(unit)
+    rows = [
+        {
+            "building_id": building.id,
+            "unit_number": u["unit_number"],
+            "bed_type": u["bed_type"],
+            "rent_cents": u["rent_cents"],
+            "availability_date": u["availability_date"],
+            "floor_plan_name": u.get("floor_plan_name"),
+            "baths": u.get("baths"),
+            "sqft": u.get("sqft"),
+            "non_canonical": u.get("non_canonical", False),
+            "scrape_run_at": now,
+        }
+        for u in units_data
+    ]
+    if rows:
+        db.execute(insert(Unit), rows)
 
+    # No refresh: building.id reloads lazily for the callers that use it
     db.commit()
-    db.refresh(building)
     return building
 
 
+# Studio $1,500 / 1BR $2,000 / 2BR $2,500, all available 2026-03-01 -- the
+# dataset shared by the bed-type and rent filter tests
+THREE_UNITS = [
+    {"unit_number": "101", "bed_type": "Studio", "rent_cents": 150000, "availability_date": "2026-03-01"},
+    {"unit_number": "102", "bed_type": "1BR", "rent_cents": 200000, "availability_date": "2026-03-01"},
+    {"unit_number": "103", "bed_type": "2BR", "rent_cents": 250000, "availability_date": "2026-03-01"},
+]
+
+
+@pytest.fixture()
+def three_unit_building(db_session):
+    """Seed one building with the THREE_UNITS dataset."""
+    return seed_building_with_units(db_session, "Test Building", "Loop", THREE_UNITS)
+
+
 # ---------------------------------------------------------------------------
 # Tests: GET /units (AGENT-01)
 # ---------------------------------------------------------------------------
@@ -88,69 +110,22 @@ class TestUnitSearch:
         assert data["total"] == 1
         assert data["units"][0]["unit_number"] == "101"
 
-    def test_filter_by_bed_type_single(self, client, agent_headers, db_session):
-        seed_building_with_units(db_session, "Test Building", "River North", [
-            {"unit_number": "101", "bed_type": "Studio", "rent_cents": 150000, "availability_date": "2026-03-01"},
-            {"unit_number": "102", "bed_type": "1BR", "rent_cents": 200000, "availability_date": "2026-03-01"},
-            {"unit_number": "103", "bed_type": "2BR", "rent_cents": 250000, "availability_date": "2026-03-01"},
-        ])
-        resp = client.get("/units", params={"beds": "1BR"}, headers=agent_headers)
-        assert resp.status_code == 200
-        data = resp.json()
-        assert data["total"] == 1
-        assert data["units"][0]["bed_type"] == "1BR"
-
-    def test_filter_by_bed_type_multi(self, client, agent_headers, db_session):
-        seed_building_with_units(db_session, "Test Building", "River North", [
-            {"unit_number": "101", "bed_type": "Studio", "rent_cents": 150000, "availability_date": "2026-03-01"},
-            {"unit_number": "102", "bed_type": "1BR", "rent_cents": 200000, "availability_date": "2026-03-01"},
-            {"unit_number": "103", "bed_type": "2BR", "rent_cents": 250000, "availability_date": "2026-03-01"},
-        ])
-        resp = client.get("/units?beds=1BR&beds=2BR", headers=agent_headers)
+    @pytest.mark.parametrize(("params", "expected_units"), [
+        pytest.param({"beds": "1BR"}, ["102"], id="bed_type_single"),
+        pytest.param({"beds": ["1BR", "2BR"]}, ["102", "103"], id="bed_type_multi"),
+        # rent filters are in dollars: 2000 means 200000 cents, inclusive
+        pytest.param({"rent_min": 2000}, ["102", "103"], id="rent_min"),
+        pytest.param({"rent_max": 2000}, ["101", "102"], id="rent_max"),
+        pytest.param({"rent_min": 1500, "rent_max": 2000}, ["101", "102"], id="rent_range"),
+    ])
+    def test_filter_three_unit_building(
+        self, client, agent_headers, three_unit_building, params, expected_units
+    ):
+        resp = client.get("/units", params=params, headers=agent_headers)
         assert resp.status_code == 200
         data = resp.json()
-        assert data["total"] == 2
-        bed_types = {u["bed_type"] for u in data["units"]}
-        assert bed_types == {"1BR", "2BR"}
-
-    def test_filter_by_rent_min(self, client, agent_headers, db_session):
-        seed_building_with_units(db_session, "Test Building", "Loop", [
-            {"unit_number": "101", "bed_type": "Studio", "rent_cents": 150000, "availability_date": "2026-03-01"},
-            {"unit_number": "102", "bed_type": "1BR", "rent_cents": 200000, "availability_date": "2026-03-01"},
-            {"unit_number": "103", "bed_type": "2BR", "rent_cents": 250000, "availability_date": "2026-03-01"},
-        ])
-        # rent_min=2000 means >= $2000 = >= 200000 cents
-        resp = client.get("/units", params={"rent_min": 2000}, headers=agent_headers)
-        assert resp.status_code == 200
-        data = resp.json()
-        assert data["total"] == 2
-        assert all(u["rent_cents"] >= 200000 for u in data["units"])
-
-    def test_filter_by_rent_max(self, client, agent_headers, db_session):
-        seed_building_with_units(db_session, "Test Building", "Loop", [
-            {"unit_number": "101", "bed_type": "Studio", "rent_cents": 150000, "availability_date": "2026-03-01"},
-            {"unit_number": "102", "bed_type": "1BR", "rent_cents": 200000, "availability_date": "2026-03-01"},
-            {"unit_number": "103", "bed_type": "2BR", "rent_cents": 250000, "availability_date": "2026-03-01"},
-        ])
-        # rent_max=2000 means <= $2000 = <= 200000 cents
-        resp = client.get("/units", params={"rent_max": 2000}, headers=agent_headers)
-        assert resp.status_code == 200
-        data = resp.json()
-        assert data["total"] == 2
-        assert all(u["rent_cents"] <= 200000 for u in data["units"])
-
-    def test_filter_by_rent_range(self, client, agent_headers, db_session):
-        seed_building_with_units(db_session, "Test Building", "Loop", [
-            {"unit_number": "101", "bed_type": "Studio", "rent_cents": 150000, "availability_date": "2026-03-01"},
-            {"unit_number": "102", "bed_type": "1BR", "rent_cents": 200000, "availability_date": "2026-03-01"},
-            {"unit_number": "103", "bed_type": "2BR", "rent_cents": 250000, "availability_date": "2026-03-01"},
-        ])
-        resp = client.get("/units", params={"rent_min": 1500, "rent_max": 2000}, headers=agent_headers)
-        assert resp.status_code == 200
-        data = resp.json()
-        assert data["total"] == 2
-        rents = {u["rent_cents"] for u in data["units"]}
-        assert rents == {150000, 200000}
+        assert data["total"] == len(expected_units)
+        assert sorted(u["unit_number"] for u in data["units"]) == expected_units
 
     def test_filter_by_available_before(self, client, agent_headers, db_session):
         seed_building_with_units(db_session, "Test Building", "River North", [
@@ -207,8 +182,7 @@ class TestUnitSearch:
         assert resp.status_code == 200
         data = resp.json()
         assert data["total"] == 2
-        neighborhoods = {u["neighborhood"] for u in data["units"]}
-        assert neighborhoods == {"River North", "Loop"}
+        assert sorted(u["neighborhood"] for u in data["units"]) == ["Loop", "River North"]
 
     def test_combined_filters(self, client, agent_headers, db_session):
         seed_building_with_units(db_session, "River North Building", "River North", [
@@ -269,12 +243,34 @@ class TestUnitSearch:
 MOCK_SCRAPE_RESULT = {"status": "success", "unit_count": 5, "error": None}
 
 
+@pytest.fixture()
+def mock_scraper(monkeypatch):
+    """Stub the scraper at the scheduler module level (admin.py uses a local import)."""
+    monkeypatch.setattr(
+        "moxie.scheduler.runner.scrape_one_building", lambda *a, **k: MOCK_SCRAPE_RESULT
+    )
+
+
+@pytest.fixture()
+def job_registry():
+    """Yield the admin router's (_jobs, _building_jobs), restored afterwards.
+
+    Restores even when the test fails, so injected or queued jobs never leak
+    into later tests.
+    """
+    jobs, building_jobs = admin_router_module._jobs, admin_router_module._building_jobs
+    saved = dict(jobs), dict(building_jobs)
+    yield jobs, building_jobs
+    jobs.clear()
+    jobs.update(saved[0])
+    building_jobs.clear()
+    building_jobs.update(saved[1])
+
+
 class TestRescrape:
-    def test_trigger_rescrape_returns_202(self, client, admin_headers, db_session):
+    def test_trigger_rescrape_returns_202(self, client, admin_headers, db_session, mock_scraper, job_registry):
         building = seed_building_with_units(db_session, "Rescrape Building", "Loop", [])
-        # Patch at the scheduler module level (admin.py uses a local import)
-        with patch("moxie.scheduler.runner.scrape_one_building", return_value=MOCK_SCRAPE_RESULT):
-            resp = client.post(f"/admin/rescrape/{building.id}", headers=admin_headers)
+        resp = client.post(f"/admin/rescrape/{building.id}", headers=admin_headers)
         assert resp.status_code == 202
         data = resp.json()
         assert "job_id" in data
@@ -285,12 +281,13 @@ class TestRescrape:
         resp = client.post("/admin/rescrape/99999", headers=admin_headers)
         assert resp.status_code == 404
 
-    def test_rescrape_duplicate_returns_409(self, client, admin_headers, db_session):
+    def test_rescrape_duplicate_returns_409(self, client, admin_headers, db_session, job_registry):
         building = seed_building_with_units(db_session, "Rescrape Building 409", "River North", [])
 
         # Directly inject an active job into _building_jobs to simulate an in-progress scrape
+        jobs, building_jobs = job_registry
         fake_job_id = "fake-job-id-409"
-        admin_router_module._jobs[fake_job_id] = {
+        jobs[fake_job_id] = {
             "job_id": fake_job_id,
             "status": "running",
             "building_id": building.id,
@@ -298,21 +295,14 @@ class TestRescrape:
             "error": None,
             "duration_seconds": None,
         }
-        admin_router_module._building_jobs[building.id] = fake_job_id
+        building_jobs[building.id] = fake_job_id
 
-        try:
-            resp = client.post(f"/admin/rescrape/{building.id}", headers=admin_headers)
-            assert resp.status_code == 409
-        finally:
-            # Cleanup to avoid cross-test pollution
-            admin_router_module._building_jobs.pop(building.id, None)
-            admin_router_module._jobs.pop(fake_job_id, None)
+        resp = client.post(f"/admin/rescrape/{building.id}", headers=admin_headers)
+        assert resp.status_code == 409
 
-    def test_poll_rescrape_returns_status(self, client, admin_headers, db_session):
+    def test_poll_rescrape_returns_status(self, client, admin_headers, db_session, mock_scraper, job_registry):
         building = seed_building_with_units(db_session, "Poll Building", "Loop", [])
-        # Patch at the scheduler module level (admin.py uses a local import)
-        with patch("moxie.scheduler.runner.scrape_one_building", return_value=MOCK_SCRAPE_RESULT):
-            trigger_resp = client.post(f"/admin/rescrape/{building.id}", headers=admin_headers)
+        trigger_resp = client.post(f"/admin/rescrape/{building.id}", headers=admin_headers)
         assert trigger_resp.status_code == 202
         job_id = trigger_resp.json()["job_id"]
 
@@ -0,0 +1,56 @@
+"""
+Shared fixtures for the unit tests.
+"""
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.pool import StaticPool
+
+from moxie.db.models import Base
+from moxie.sync.sheets import open_spreadsheet
+
+
+def _make_engine():
+    """In-memory SQLite engine on one shared connection, ready for SAVEPOINT-per-test."""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+
+    # pysqlite's own transaction handling breaks SAVEPOINT; let SQLAlchemy
+    # emit BEGIN itself so a test's commit() can release a savepoint instead.
+    # An in-memory database already journals in memory with nothing to fsync;
+    # keep its temp tables/indices (ORDER BY, DISTINCT) off disk as well.
+    @event.listens_for(engine, "connect")
+    def _configure_sqlite(dbapi_conn, connection_record):
+        dbapi_conn.isolation_level = None
+        cursor = dbapi_conn.cursor()
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.close()
+
+    @event.listens_for(engine, "begin")
+    def _emit_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
+    return engine
+
+
+@pytest.fixture(scope="session")
+def _engine():
+    """In-memory SQLite engine with the schema created once for the whole run.
+
+    Tests must roll back what they write: open a connection, begin() on it and
+    bind sessions with join_transaction_mode="create_savepoint".
+    """
+    engine = _make_engine()
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture(autouse=True)
+def _fresh_spreadsheet_client():
+    """Drop the memoized Sheets client so each test sees its own mocked gspread."""
+    open_spreadsheet.cache_clear()
+    yield
+    open_spreadsheet.cache_clear()
@@ -0,0 +1,113 @@
+"""
+Unit tests for moxie.sync.export_platforms.
+
+gspread is mocked; the DB is an in-memory SQLite session.
+"""
+
+import pytest
+from unittest.mock import patch, MagicMock
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from moxie.db.models import Base, Building
+from moxie.sync.export_platforms import export_platforms
+
+
+HEADERS = ["Building Name", "Neighborhood", "Website", "Platform"]
+
+
+def _mock_gc(headers: list[str], url_column: list[list]):
+    """Return (mocked gspread client, worksheet) serving the given header row and Website column."""
+    mock_ws = MagicMock()
+    mock_ws.row_values.return_value = headers
+    mock_ws.col_count = len(headers)
+    mock_ws.batch_get.return_value = [url_column]
+    mock_sh = MagicMock()
+    mock_sh.worksheet.return_value = mock_ws
+    mock_gc = MagicMock()
+    mock_gc.open_by_key.return_value = mock_sh
+    return mock_gc, mock_ws
+
+
+@pytest.fixture
+def db():
+    """Provide a fresh in-memory SQLite session for each test."""
+    engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+    session = Session()
+    session.add_all([
+        Building(name="A", url="https://a.example.com", platform="rentcafe"),
+        Building(name="B", url="https://b.example.com", platform=None),
+    ])
+    session.commit()
+    yield session
+    session.close()
+
+
+class TestExportPlatforms:
+    def test_contiguous_matches_are_written_as_one_range(self, db):
+        gc, ws = _mock_gc(
+            HEADERS,
+            [["https://a.example.com"], ["https://b.example.com"]],
+        )
+        with patch("moxie.sync.export_platforms.gspread.service_account", return_value=gc):
+            result = export_platforms(db)
+
+        ws.batch_get.assert_called_once_with(["C2:C"])
+        ws.batch_update.assert_called_once_with([
+            {"range": "D2:D3", "values": [["rentcafe"], ["needs_classification"]]},
+        ])
+        assert result == {"written": 2, "skipped": 0}
+
+    def test_unmatched_rows_are_not_written(self, db):
+        gc, ws = _mock_gc(
+            HEADERS,
+            [
+                ["https://a.example.com"],
+                [],
+                ["https://not-in-db.example.com"],
+                ["https://b.example.com"],
+            ],
+        )
+        with patch("moxie.sync.export_platforms.gspread.service_account", return_value=gc):
+            result = export_platforms(db)
+
+        ws.batch_update.assert_called_once_with([
+            {"range": "D2:D2", "values": [["rentcafe"]]},
+            {"range": "D5:D5", "values": [["needs_classification"]]},
+        ])
+        ws.update.assert_not_called()
+        assert result == {"written": 2, "skipped": 2}
+
+    def test_missing_platform_header_is_created(self, db):
+        gc, ws = _mock_gc(HEADERS[:3], [["https://a.example.com"]])
+        with patch("moxie.sync.export_platforms.gspread.service_account", return_value=gc):
+            export_platforms(db)
+
+        ws.add_cols.assert_called_once_with(1)
+        ws.update_cell.assert_called_once_with(1, 4, "Platform")
+
+    def test_platform_header_goes_past_unlabeled_columns(self, db):
+        """Trailing blank-header columns (trimmed from row_values) are not overwritten."""
+        gc, ws = _mock_gc(HEADERS[:3], [["https://a.example.com"]])
+        ws.col_count = 5  # columns D and E have no header but may hold data
+        with patch("moxie.sync.export_platforms.gspread.service_account", return_value=gc):
+            export_platforms(db)
+
+        ws.update_cell.assert_called_once_with(1, 6, "Platform")
+        ws.batch_update.assert_called_once_with([{"range": "F2:F2", "values": [["rentcafe"]]}])
+
+    def test_no_matches_writes_nothing(self, db):
+        gc, ws = _mock_gc(HEADERS, [["https://nope.example.com"]])
+        with patch("moxie.sync.export_platforms.gspread.service_account", return_value=gc):
+            result = export_platforms(db)
+
+        ws.batch_update.assert_not_called()
+        assert result == {"written": 0, "skipped": 1}
+
+    def test_empty_sheet_raises_value_error(self, db):
+        gc, _ = _mock_gc([], [])
+        with patch("moxie.sync.export_platforms.gspread.service_account", return_value=gc):
+            with pytest.raises(ValueError, match="empty"):
+                export_platforms(db)
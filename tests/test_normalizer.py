@@ -9,7 +9,7 @@ import pytest
 from datetime import date
 from pydantic import ValidationError
 
-from moxie.normalizer import normalize
+from moxie.normalizer import normalize, normalize_batch
 
 
 # ---------------------------------------------------------------------------
@@ -178,6 +178,14 @@ class TestRentNormalization:
         result = normalize(_base({"rent": "$1,500.00"}), building_id=1)
         assert type(result["rent_cents"]) is int
 
+    def test_single_digit_cents(self):
+        result = normalize(_base({"rent": "$1,500.5"}), building_id=1)
+        assert result["rent_cents"] == 150050
+
+    def test_price_range_takes_lower_value(self):
+        result = normalize(_base({"rent": "$2,211 – $2,799"}), building_id=1)
+        assert result["rent_cents"] == 221100
+
 
 # ---------------------------------------------------------------------------
 # Date normalization
@@ -209,6 +217,19 @@ class TestDateNormalization:
         result = normalize(_base({"availability_date": "3/1/26"}), building_id=1)
         assert result["availability_date"] == "2026-03-01"
 
+    def test_date_without_year_uses_current_year(self):
+        result = normalize(_base({"availability_date": "Mar 15"}), building_id=1)
+        assert result["availability_date"] == f"{date.today().year}-03-15"
+
+    def test_available_prefix_with_us_date(self):
+        result = normalize(_base({"availability_date": "Available 3/25/2026"}), building_id=1)
+        assert result["availability_date"] == "2026-03-25"
+
+    @pytest.mark.parametrize("bad", ["2026-02-30", "13/01/2026"])
+    def test_impossible_date_raises(self, bad):
+        with pytest.raises(ValidationError):
+            normalize(_base({"availability_date": bad}), building_id=1)
+
 
 # ---------------------------------------------------------------------------
 # Optional fields
@@ -274,6 +295,12 @@ class TestOutputStructure:
         result = normalize(_base(), building_id=1)
         assert isinstance(result["scrape_run_at"], datetime)
 
+    def test_scrape_run_at_can_be_supplied(self):
+        from datetime import datetime, timezone
+        run_at = datetime(2026, 3, 1, 8, 30, tzinfo=timezone.utc)
+        result = normalize(_base(), building_id=1, scrape_run_at=run_at)
+        assert result["scrape_run_at"] == run_at
+
 
 # ---------------------------------------------------------------------------
 # Required field enforcement (ValidationError)
@@ -300,3 +327,37 @@ class TestRequiredFieldEnforcement:
         raw = {"unit_number": "101", "bed_type": "1", "rent": "1500"}
         with pytest.raises(ValidationError):
             normalize(raw, building_id=1)
+
+    def test_missing_fields_reported_together(self):
+        raw = {"unit_number": "101", "bed_type": "1"}
+        with pytest.raises(ValidationError) as exc_info:
+            normalize(raw, building_id=1)
+        errors = exc_info.value.errors()
+        assert [(e["type"], e["loc"]) for e in errors] == [
+            ("missing", ("rent",)), ("missing", ("availability_date",)),
+        ]
+
+
+# ---------------------------------------------------------------------------
+# Batch normalization
+# ---------------------------------------------------------------------------
+
+class TestNormalizeBatch:
+
+    def test_skips_unparseable_rows_and_keeps_order(self):
+        rows = [
+            _base({"unit_number": "101"}),
+            _base({"unit_number": "102", "rent": "Call"}),
+            {"unit_number": "103", "bed_type": "1"},
+            _base({"unit_number": "104"}),
+        ]
+        result = normalize_batch(rows, building_id=7)
+        assert [u["unit_number"] for u in result] == ["101", "104"]
+        assert all(u["building_id"] == 7 for u in result)
+
+    def test_rows_share_one_scrape_timestamp(self):
+        result = normalize_batch([_base({"unit_number": "101"}), _base({"unit_number": "102"})], 1)
+        assert result[0]["scrape_run_at"] is result[1]["scrape_run_at"]
+
+    def test_empty_input(self):
+        assert normalize_batch([], building_id=1) == []
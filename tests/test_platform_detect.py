@@ -50,6 +50,13 @@ def test_detect_platform_path_does_not_match_hostname():
     assert result is None
 
 
+def test_detect_platform_matches_whole_domain_labels():
+    """Only the platform domain or its subdomains match, not lookalike hosts."""
+    assert detect_platform("https://notrentcafe.com/") is None
+    assert detect_platform("https://foo.rentcafe.com:8443/apartments") == "rentcafe"
+    assert detect_platform("foo.bozzuto.com/apartments") == "bozzuto"
+
+
 def test_detect_platform_case_insensitive():
     """URL matching is case-insensitive."""
     assert detect_platform("https://THEBUILDING.RENTCAFE.COM/apartments") == "rentcafe"
@@ -0,0 +1,96 @@
+"""
+Unit tests for moxie.sync.push_availability.
+
+gspread is mocked; the DB is an in-memory SQLite session.
+"""
+
+from datetime import datetime
+
+import pytest
+from unittest.mock import patch, MagicMock
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from moxie.db.models import Base, Building, Unit
+from moxie.sync.push_availability import push_availability
+
+
+SCRAPED_AT = datetime(2026, 3, 1, 8, 30)
+
+
+def _unit(unit_number: str, rent_cents: int = 150000, **kwargs) -> Unit:
+    """Return a Unit with the required columns filled in."""
+    fields = {
+        "unit_number": unit_number,
+        "bed_type": "1BR",
+        "rent_cents": rent_cents,
+        "availability_date": "2026-04-01",
+        "scrape_run_at": SCRAPED_AT,
+    }
+    fields.update(kwargs)
+    return Unit(**fields)
+
+
+def _mock_gc():
+    """Return (mocked gspread client, Availability worksheet)."""
+    mock_ws = MagicMock()
+    mock_sh = MagicMock()
+    mock_sh.worksheet.return_value = mock_ws
+    mock_gc = MagicMock()
+    mock_gc.open_by_key.return_value = mock_sh
+    return mock_gc, mock_ws
+
+
+@pytest.fixture
+def db():
+    """Provide a fresh in-memory SQLite session with two buildings' units."""
+    engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+    session = Session()
+    zeta = Building(name="zeta Tower", url="https://zeta.example.com", neighborhood="Loop")
+    zeta.units = [_unit("202"), _unit("101", rent_cents=0)]
+    alpha = Building(name="Alpha Lofts", url="https://alpha.example.com",
+                     management_company="Greystar")
+    alpha.units = [_unit("3B", floor_plan_name="B1", baths="1", sqft=700)]
+    session.add_all([zeta, alpha])
+    session.commit()
+    yield session
+    session.close()
+
+
+class TestPushAvailability:
+    def test_rows_sorted_by_building_then_unit(self, db):
+        gc, ws = _mock_gc()
+        with patch("moxie.sync.sheets.gspread.service_account", return_value=gc):
+            count = push_availability(db)
+
+        rows = ws.update.call_args.kwargs["values"]
+        assert count == 3
+        ws.clear.assert_called_once_with()
+        ws.resize.assert_not_called()
+        assert ws.update.call_args.kwargs["range_name"] == "A1:L4"
+        assert [(r[0], r[2]) for r in rows[1:]] == [
+            ("Alpha Lofts", "3B"), ("zeta Tower", "101"), ("zeta Tower", "202"),
+        ]
+
+    def test_row_formatting(self, db):
+        gc, ws = _mock_gc()
+        with patch("moxie.sync.sheets.gspread.service_account", return_value=gc):
+            push_availability(db)
+
+        rows = ws.update.call_args.kwargs["values"]
+        assert rows[1] == [
+            "Alpha Lofts", "", "3B", "1BR", "$1,500", "2026-04-01", "B1", "1", "700",
+            "Greystar", "2026-03-01 08:30 UTC", "https://alpha.example.com",
+        ]
+        assert rows[2][4] == "N/A"
+
+    def test_building_ids_filter(self, db):
+        zeta_id = db.query(Building.id).filter_by(name="zeta Tower").scalar()
+        gc, ws = _mock_gc()
+        with patch("moxie.sync.sheets.gspread.service_account", return_value=gc):
+            count = push_availability(db, building_ids=[zeta_id])
+
+        assert count == 2
+        assert {r[0] for r in ws.update.call_args.kwargs["values"][1:]} == {"zeta Tower"}
@@ -6,7 +6,10 @@ Proves that when a scraper raises an exception:
   - The building is marked stale (last_scrape_status='failed')
   - A ScrapeRun record is logged with status='failed'
 
-Uses in-memory SQLite (no .env, no file DB required).
+Also covers the Tier 3 batch (_scrape_llm_batch) failing as a whole.
+
+Uses the shared in-memory SQLite `_engine` from tests/conftest.py (no .env,
+no file DB required); each test runs in a transaction rolled back afterwards.
 Patches SessionLocal in moxie.scheduler.runner to return a fresh session
 from the test engine. Uses a separate inspection session to verify state
 after the runner closes its own session.
@@ -15,10 +18,9 @@ import pytest
 from datetime import datetime, timezone
 from unittest.mock import patch, MagicMock
 
-from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
-from moxie.db.models import Base, Building, Unit, ScrapeRun
+from moxie.db.models import Building, Unit, ScrapeRun
 
 
 # ---------------------------------------------------------------------------
@@ -26,17 +28,17 @@ from moxie.db.models import Base, Building, Unit, ScrapeRun
 # ---------------------------------------------------------------------------
 
 @pytest.fixture
-def engine():
-    """In-memory SQLite engine with schema created. Shared within one test."""
-    eng = create_engine("sqlite:///:memory:")
-    Base.metadata.create_all(eng)
-    return eng
-
+def Session(_engine):
+    """Session factory whose sessions all join one transaction rolled back after the test.
 
-@pytest.fixture
-def Session(engine):
-    """Session factory for the test engine."""
-    return sessionmaker(bind=engine)
+    Each session's commit() only releases a SAVEPOINT, so the runner's writes
+    are visible to the inspection session but nothing outlives the test.
+    """
+    connection = _engine.connect()
+    transaction = connection.begin()
+    yield sessionmaker(bind=connection, join_transaction_mode="create_savepoint")
+    transaction.rollback()
+    connection.close()
 
 
 @pytest.fixture
@@ -167,3 +169,59 @@ class TestRunnerFailureHandling:
         assert "Network timeout" in error_message, (
             f"Expected 'Network timeout' in error_message, got: '{error_message}'"
         )
+
+
+class TestLLMBatchFailureHandling:
+    def test_batch_crash_records_failure_for_unsaved_buildings(self, Session, building):
+        """A scrape_many crash marks every building without a result as failed, once."""
+        from moxie.scheduler.batch import _scrape_llm_batch
+
+        with Session() as s:
+            other = Building(name="Other", url="https://other.example.com", platform="llm")
+            s.add(other)
+            s.commit()
+            other_id = other.id
+
+        async def crashing_scrape_many(buildings, *, on_outcome, **kwargs):
+            on_outcome(building, [])
+            raise RuntimeError("browser launch failed")
+
+        specs = [
+            (building, "Test Building", "https://example.com", "llm"),
+            (other_id, "Other", "https://other.example.com", "llm"),
+        ]
+        with (
+            patch("moxie.scheduler.runner.SessionLocal", Session),
+            patch("moxie.scrapers.tier3.llm.scrape_many", crashing_scrape_many),
+        ):
+            results = _scrape_llm_batch(specs)
+
+        assert [(r["building_id"], r["status"], r["platform"]) for r in results] == [
+            (building, "success", "llm"),
+            (other_id, "failed", "llm"),
+        ]
+        assert "browser launch failed" in results[1]["error"]
+        with Session() as inspect:
+            runs = inspect.query(ScrapeRun.building_id, ScrapeRun.status).all()
+            other_status = inspect.get(Building, other_id).last_scrape_status
+        assert sorted(runs) == sorted([(building, "success"), (other_id, "failed")])
+        assert other_status == "failed"
+
+    def test_batch_runs_with_the_tier3_platforms_combined_slots(self, Session, building):
+        """The batch renders as many buildings at once as llm, entrata and mri allowed together."""
+        from moxie.scheduler.batch import _scrape_llm_batch
+
+        seen = {}
+
+        async def fake_scrape_many(buildings, *, on_outcome, **kwargs):
+            seen.update(kwargs)
+            for b in buildings:
+                on_outcome(b.id, [])
+
+        with (
+            patch("moxie.scheduler.runner.SessionLocal", Session),
+            patch("moxie.scrapers.tier3.llm.scrape_many", fake_scrape_many),
+        ):
+            _scrape_llm_batch([(building, "Test Building", "https://example.com", "llm")])
+
+        assert seen["concurrency"] == 3
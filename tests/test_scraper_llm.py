@@ -5,15 +5,19 @@ Strategy:
 - For scrape() tests that check EnvironmentError: let it run directly (no network needed)
 - For scrape() tests that check result passthrough: monkeypatch _scrape_with_llm
 - For _scrape_with_llm tests (JSON parsing, filtering): monkeypatch AsyncWebCrawler
-  context manager so Playwright is never invoked
+  context manager so Playwright is never invoked, and AsyncAnthropic so Claude's
+  reply is canned
 
 No real network calls, no real API calls, no Playwright browser needed.
 """
 import asyncio
 import json
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import httpx
 import pytest
+from pytest_httpx import HTTPXMock
 
 import moxie.scrapers.tier3.llm as llm_module
 from moxie.scrapers.tier3.llm import scrape, _scrape_with_llm
@@ -23,6 +27,31 @@ from moxie.scrapers.tier3.llm import scrape, _scrape_with_llm
 # Helpers
 # ---------------------------------------------------------------------------
 
+@pytest.fixture(autouse=True)
+def _isolated_llm_cache(tmp_path, monkeypatch):
+    """Point the extraction cache at a per-test file so tests never share hits."""
+    monkeypatch.setattr(llm_module, "LLM_CACHE_PATH", str(tmp_path / "llm_cache.db"))
+
+
+@pytest.fixture(autouse=True)
+def _no_http_precheck(request, monkeypatch):
+    """Leave every subpage undecided by plain HTTP so tests never hit the network.
+
+    Tests that mock HTTP themselves (httpx_mock) exercise the real precheck.
+    """
+    if "httpx_mock" in request.fixturenames:
+        return
+
+    async def undecided(http, url):
+        return None
+
+    monkeypatch.setattr(llm_module, "_http_precheck", undecided)
+
+
+# A rendered availability page with enough unit content to be sent to Claude
+UNITS_MARKDOWN = "| Unit 101 | Studio | 450 sq ft | $1,200/mo | Available Now |"
+
+
 def _make_building(url="https://example.com/apartments"):
     """Return a minimal Building-like object (duck-typed) for tests."""
     class FakeBuilding:
@@ -47,26 +76,24 @@ def _make_unit(unit_number="101", bed_type="1 Bedroom", rent="$1,500/mo",
     return unit
 
 
-def _make_fake_crawler_ctx(extracted_content):
+def _make_fake_crawler_ctx(markdown="# Listings"):
     """
     Return a mock async context manager that simulates AsyncWebCrawler.
-    The crawler's arun() returns a FakeResult with the given extracted_content.
+    Every arun() returns a FakeResult whose markdown is the given page text.
     Does NOT launch Playwright.
 
     FakeResult.links is set to {} so the two-pass _find_availability_link
-    finds no internal links and falls back to the original URL, allowing
-    Pass 2 (LLM extraction) to proceed with extracted_content.
+    finds no internal links and falls back to the original URL.
     """
     class FakeResult:
         pass
 
     result = FakeResult()
-    result.extracted_content = extracted_content
     result.links = {}   # Pass 1: no internal links → fall back to original URL
-    result.html = ""    # Pass 1 also checks .html in some paths
+    result.html = ""
     result.success = True          # _probe_subpage checks this
     result.status_code = 200       # _probe_subpage checks this after .success
-    result.markdown = ""           # _probe_subpage checks this for content keywords
+    result.markdown = markdown     # _probe_subpage checks this for content keywords
 
     mock_crawler = MagicMock()
     mock_crawler.arun = AsyncMock(return_value=result)
@@ -78,6 +105,26 @@ def _make_fake_crawler_ctx(extracted_content):
     return mock_ctx
 
 
+def _fake_message(reply):
+    """
+    Return a Messages API response whose text is reply minus the "[" the
+    scraper prefills -- so reply reads as Claude's complete JSON output.
+    """
+    text = reply or ""
+    if text.startswith("["):
+        text = text[1:]
+    return SimpleNamespace(content=[SimpleNamespace(type="text", text=text)])
+
+
+def _make_fake_anthropic(reply):
+    """Return a mock AsyncAnthropic class whose messages.create() answers with reply."""
+    client = MagicMock()
+    client.__aenter__ = AsyncMock(return_value=client)
+    client.__aexit__ = AsyncMock(return_value=None)
+    client.messages.create = AsyncMock(return_value=_fake_message(reply))
+    return MagicMock(return_value=client)
+
+
 # ---------------------------------------------------------------------------
 # Test: EnvironmentError when ANTHROPIC_API_KEY is missing
 # ---------------------------------------------------------------------------
@@ -151,34 +198,75 @@ def test_scrape_returns_all_valid_records(monkeypatch):
 # (AsyncWebCrawler is mocked -- no Playwright launched)
 # ---------------------------------------------------------------------------
 
+def _run_scrape_with_llm(reply, markdown=UNITS_MARKDOWN):
+    """Run _scrape_with_llm against a fake page and a canned Claude reply."""
+    mock_ctx = _make_fake_crawler_ctx(markdown)
+    with patch("moxie.scrapers.tier3.llm.AsyncWebCrawler", mock_ctx), \
+            patch("moxie.scrapers.tier3.llm.AsyncAnthropic", _make_fake_anthropic(reply)):
+        return asyncio.run(_scrape_with_llm("https://example.com"))
+
+
 def test_scrape_with_llm_returns_empty_on_malformed_json(monkeypatch):
-    """_scrape_with_llm returns [] when extracted_content is invalid JSON."""
+    """_scrape_with_llm returns [] when Claude's reply is invalid JSON."""
     monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
-
-    mock_ctx = _make_fake_crawler_ctx("not valid json{{")
-    with patch("moxie.scrapers.tier3.llm.AsyncWebCrawler", mock_ctx):
-        result = asyncio.run(_scrape_with_llm("https://example.com"))
-    assert result == []
+    assert _run_scrape_with_llm("not valid json{{") == []
 
 
 def test_scrape_with_llm_returns_empty_on_null_content(monkeypatch):
-    """_scrape_with_llm returns [] when extracted_content is None."""
+    """_scrape_with_llm returns [] when Claude's reply has no text."""
     monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+    assert _run_scrape_with_llm(None) == []
 
-    mock_ctx = _make_fake_crawler_ctx(None)
-    with patch("moxie.scrapers.tier3.llm.AsyncWebCrawler", mock_ctx):
+
+def test_scrape_with_llm_returns_empty_on_dict_json(monkeypatch):
+    """_scrape_with_llm returns [] when Claude's reply is a JSON object (not list)."""
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+    assert _run_scrape_with_llm(json.dumps({"key": "value"})) == []
+
+
+def test_scrape_with_llm_skips_llm_for_empty_page(monkeypatch):
+    """A page that rendered to empty markdown is never sent to Claude."""
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+
+    client_cls = _make_fake_anthropic("[]")
+    with patch("moxie.scrapers.tier3.llm.AsyncWebCrawler", _make_fake_crawler_ctx("")), \
+            patch("moxie.scrapers.tier3.llm.AsyncAnthropic", client_cls):
         result = asyncio.run(_scrape_with_llm("https://example.com"))
+
     assert result == []
+    client_cls.assert_not_called()
 
 
-def test_scrape_with_llm_returns_empty_on_dict_json(monkeypatch):
-    """_scrape_with_llm returns [] when extracted_content is a JSON object (not list)."""
+def test_scrape_with_llm_skips_llm_for_page_without_unit_content(monkeypatch):
+    """A page with too few content keywords (prices, beds, sqft) is never sent to Claude."""
     monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
 
-    mock_ctx = _make_fake_crawler_ctx(json.dumps({"key": "value"}))
-    with patch("moxie.scrapers.tier3.llm.AsyncWebCrawler", mock_ctx):
+    client_cls = _make_fake_anthropic("[]")
+    mock_ctx = _make_fake_crawler_ctx("# Welcome home\nCall us to schedule a tour")
+    with patch("moxie.scrapers.tier3.llm.AsyncWebCrawler", mock_ctx), \
+            patch("moxie.scrapers.tier3.llm.AsyncAnthropic", client_cls):
         result = asyncio.run(_scrape_with_llm("https://example.com"))
+
     assert result == []
+    client_cls.assert_not_called()
+
+
+def test_scrape_with_llm_sends_schema_system_prompt_and_prefill(monkeypatch):
+    """The instruction + schema go in the system prompt; the reply is prefilled with "["."""
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+
+    client_cls = _make_fake_anthropic("[]")
+    with patch("moxie.scrapers.tier3.llm.AsyncWebCrawler", _make_fake_crawler_ctx(UNITS_MARKDOWN)), \
+            patch("moxie.scrapers.tier3.llm.AsyncAnthropic", client_cls):
+        asyncio.run(_scrape_with_llm("https://example.com"))
+
+    kwargs = client_cls.return_value.messages.create.await_args.kwargs
+    assert kwargs["system"] == llm_module._SYSTEM_BLOCKS
+    assert '"unit_number"' in kwargs["system"][0]["text"]
+    assert kwargs["messages"] == [
+        {"role": "user", "content": UNITS_MARKDOWN},
+        {"role": "assistant", "content": "["},
+    ]
 
 
 def test_scrape_filters_incomplete_records(monkeypatch):
@@ -190,9 +278,7 @@ def test_scrape_filters_incomplete_records(monkeypatch):
         _make_unit(unit_number="202", bed_type="1 Bedroom", rent="$1,800/mo"),
         {"unit_number": "303", "bed_type": "2BR"},  # no rent -> filtered
     ]
-    mock_ctx = _make_fake_crawler_ctx(json.dumps(units))
-    with patch("moxie.scrapers.tier3.llm.AsyncWebCrawler", mock_ctx):
-        result = asyncio.run(_scrape_with_llm("https://example.com"))
+    result = _run_scrape_with_llm(json.dumps(units))
     assert len(result) == 2
     assert all("rent" in r for r in result)
 
@@ -205,9 +291,7 @@ def test_unit_number_field_required(monkeypatch):
         {"bed_type": "1 Bedroom", "rent": "$1,500/mo", "availability_date": "Now"},  # no unit_number
         _make_unit(unit_number="101", bed_type="Studio", rent="$1,200/mo"),
     ]
-    mock_ctx = _make_fake_crawler_ctx(json.dumps(units))
-    with patch("moxie.scrapers.tier3.llm.AsyncWebCrawler", mock_ctx):
-        result = asyncio.run(_scrape_with_llm("https://example.com"))
+    result = _run_scrape_with_llm(json.dumps(units))
     assert len(result) == 1
     assert result[0]["unit_number"] == "101"
 
@@ -220,9 +304,7 @@ def test_bed_type_field_required(monkeypatch):
         {"unit_number": "101", "rent": "$1,500/mo", "availability_date": "Now"},  # no bed_type
         _make_unit(unit_number="202", bed_type="2BR", rent="$2,000/mo"),
     ]
-    mock_ctx = _make_fake_crawler_ctx(json.dumps(units))
-    with patch("moxie.scrapers.tier3.llm.AsyncWebCrawler", mock_ctx):
-        result = asyncio.run(_scrape_with_llm("https://example.com"))
+    result = _run_scrape_with_llm(json.dumps(units))
     assert len(result) == 1
     assert result[0]["unit_number"] == "202"
 
@@ -238,9 +320,502 @@ def test_scrape_with_llm_filters_and_returns_valid_records(monkeypatch):
          "availability_date": "March 1, 2026"},
         {"bed_type": "2BR", "rent": "$2,000/mo"},  # missing unit_number -> filtered
     ]
-    mock_ctx = _make_fake_crawler_ctx(json.dumps(units))
-    with patch("moxie.scrapers.tier3.llm.AsyncWebCrawler", mock_ctx):
-        result = asyncio.run(_scrape_with_llm("https://example.com"))
+    result = _run_scrape_with_llm(json.dumps(units))
     assert len(result) == 2
     assert result[0]["unit_number"] == "101"
     assert result[1]["unit_number"] == "202"
+
+
+def test_unchanged_markdown_reuses_cached_extraction(monkeypatch):
+    """A second scrape of an unchanged page returns the cached units without re-extracting."""
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+
+    units = [_make_unit(unit_number="101", bed_type="Studio", rent="$1,200/mo")]
+    mock_ctx = _make_fake_crawler_ctx("Unit 101 Studio $1,200/mo")
+    client_cls = _make_fake_anthropic(json.dumps(units))
+    with patch("moxie.scrapers.tier3.llm.AsyncWebCrawler", mock_ctx), \
+            patch("moxie.scrapers.tier3.llm.AsyncAnthropic", client_cls):
+        first = asyncio.run(_scrape_with_llm("https://example.com"))
+
+        # The LLM would now return nothing -- the cache must short-circuit it
+        client_cls.return_value.messages.create.return_value = _fake_message("[]")
+        second = asyncio.run(_scrape_with_llm("https://example.com"))
+
+    assert [u["unit_number"] for u in first] == ["101"]
+    assert second == first
+    assert client_cls.return_value.messages.create.await_count == 1
+
+
+def test_changed_markdown_reruns_extraction(monkeypatch):
+    """A page whose markdown changed since the cached run is extracted again."""
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+
+    units = [_make_unit(unit_number="101", bed_type="Studio", rent="$1,200/mo")]
+    mock_ctx = _make_fake_crawler_ctx("Unit 101 Studio $1,200/mo")
+    client_cls = _make_fake_anthropic(json.dumps(units))
+    with patch("moxie.scrapers.tier3.llm.AsyncWebCrawler", mock_ctx), \
+            patch("moxie.scrapers.tier3.llm.AsyncAnthropic", client_cls):
+        asyncio.run(_scrape_with_llm("https://example.com"))
+
+        mock_ctx.return_value.arun.return_value.markdown = "No units available"
+        client_cls.return_value.messages.create.return_value = _fake_message("[]")
+        second = asyncio.run(_scrape_with_llm("https://example.com"))
+
+    assert second == []
+
+
+def test_scrape_with_llm_launches_one_browser_for_both_passes(monkeypatch):
+    """Link discovery and extraction share a single AsyncWebCrawler."""
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+    mock_ctx = _make_fake_crawler_ctx()
+    with patch("moxie.scrapers.tier3.llm.AsyncWebCrawler", mock_ctx), \
+            patch("moxie.scrapers.tier3.llm.AsyncAnthropic", _make_fake_anthropic("[]")):
+        asyncio.run(_scrape_with_llm("https://example.com/apartments"))
+
+    assert mock_ctx.call_count == 1
+
+
+# ---------------------------------------------------------------------------
+# Tests for scrape_many (multi-building, shared crawler, Message Batches)
+# ---------------------------------------------------------------------------
+
+def _make_fake_batch_client(results):
+    """
+    Return a mock AsyncAnthropic class whose batch ends immediately.
+
+    results maps custom_id to the reply text (after the prefilled "["), or to
+    a result type string such as "errored" for a failed request.
+    """
+    def _entry(custom_id, outcome):
+        if outcome in ("errored", "expired", "canceled"):
+            return SimpleNamespace(custom_id=custom_id, result=SimpleNamespace(type=outcome))
+        message = SimpleNamespace(content=[SimpleNamespace(type="text", text=outcome)])
+        return SimpleNamespace(
+            custom_id=custom_id,
+            result=SimpleNamespace(type="succeeded", message=message),
+        )
+
+    async def _results(batch_id):
+        async def _stream():
+            for custom_id, outcome in results.items():
+                yield _entry(custom_id, outcome)
+        return _stream()
+
+    client = MagicMock()
+    client.__aenter__ = AsyncMock(return_value=client)
+    client.__aexit__ = AsyncMock(return_value=None)
+    client.messages.batches.create = AsyncMock(
+        return_value=SimpleNamespace(id="msgbatch_1", processing_status="ended")
+    )
+    client.messages.batches.results = _results
+    return MagicMock(return_value=client)
+
+
+def test_scrape_many_returns_units_keyed_by_building_id(monkeypatch):
+    """scrape_many() maps each building id to its unit list, sharing one crawler and one batch."""
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+
+    a = _make_building("https://a.example.com")
+    a.id = 1
+    b = _make_building("https://b.example.com")
+    b.id = 2
+    units = [_make_unit(unit_number="101", bed_type="Studio", rent="$1,200/mo")]
+    mock_ctx = _make_fake_crawler_ctx(UNITS_MARKDOWN)
+    client_cls = _make_fake_batch_client({"1": json.dumps(units)[1:], "2": "]"})
+    with patch("moxie.scrapers.tier3.llm.AsyncWebCrawler", mock_ctx), \
+            patch("moxie.scrapers.tier3.llm.AsyncAnthropic", client_cls):
+        outcomes = asyncio.run(llm_module.scrape_many([a, b]))
+
+    assert mock_ctx.call_count == 1
+    batch_create = client_cls.return_value.messages.batches.create
+    assert batch_create.await_count == 1
+    assert [r["custom_id"] for r in batch_create.await_args.kwargs["requests"]] == ["1", "2"]
+    assert [u["unit_number"] for u in outcomes[1]] == ["101"]
+    assert outcomes[2] == []
+
+
+def test_scrape_many_failed_batch_request_is_that_buildings_error(monkeypatch):
+    """A batch entry that errored becomes an LLMScraperError for that building only."""
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+
+    a = _make_building("https://a.example.com")
+    a.id = 1
+    b = _make_building("https://b.example.com")
+    b.id = 2
+    mock_ctx = _make_fake_crawler_ctx(UNITS_MARKDOWN)
+    client_cls = _make_fake_batch_client({"1": "]", "2": "errored"})
+    with patch("moxie.scrapers.tier3.llm.AsyncWebCrawler", mock_ctx), \
+            patch("moxie.scrapers.tier3.llm.AsyncAnthropic", client_cls):
+        outcomes = asyncio.run(llm_module.scrape_many([a, b]))
+
+    assert outcomes[1] == []
+    assert isinstance(outcomes[2], llm_module.LLMScraperError)
+
+
+def test_scrape_many_skips_batch_when_every_page_is_cached(monkeypatch):
+    """Pages whose markdown is unchanged reuse the cache and submit no batch."""
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+
+    building = _make_building()
+    units = [_make_unit(unit_number="7A")]
+    mock_ctx = _make_fake_crawler_ctx(UNITS_MARKDOWN)
+    client_cls = _make_fake_batch_client({"1": json.dumps(units)[1:]})
+    with patch("moxie.scrapers.tier3.llm.AsyncWebCrawler", mock_ctx), \
+            patch("moxie.scrapers.tier3.llm.AsyncAnthropic", client_cls):
+        asyncio.run(llm_module.scrape_many([building]))
+        outcomes = asyncio.run(llm_module.scrape_many([building]))
+
+    assert client_cls.return_value.messages.batches.create.await_count == 1
+    assert [u["unit_number"] for u in outcomes[building.id]] == ["7A"]
+
+
+def test_scrape_many_force_refresh_ignores_caches(monkeypatch):
+    """force_refresh rediscovers the subpage and re-extracts even a cached page."""
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+
+    building = _make_building()
+    units = [_make_unit(unit_number="7A")]
+    mock_ctx = _make_fake_crawler_ctx(UNITS_MARKDOWN)
+    client_cls = _make_fake_batch_client({"1": json.dumps(units)[1:]})
+    with patch("moxie.scrapers.tier3.llm.AsyncWebCrawler", mock_ctx), \
+            patch("moxie.scrapers.tier3.llm.AsyncAnthropic", client_cls):
+        asyncio.run(llm_module.scrape_many([building]))
+        lookups = _count_link_lookups(monkeypatch, None)
+        asyncio.run(llm_module.scrape_many([building], force_refresh=True))
+
+    assert lookups == [building.url]
+    assert client_cls.return_value.messages.batches.create.await_count == 2
+
+
+def test_scrape_many_falls_back_to_direct_calls_when_batch_overruns(monkeypatch):
+    """A batch still running past the deadline is canceled; pages are extracted directly."""
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+    monkeypatch.setattr(llm_module, "_BATCH_MAX_WAIT_SECONDS", 0)
+    monkeypatch.setattr(llm_module, "_BATCH_POLL_SECONDS", 0)
+
+    building = _make_building()
+    units = [_make_unit(unit_number="7A")]
+    client_cls = _make_fake_batch_client({})
+    client = client_cls.return_value
+    client.messages.batches.create.return_value = SimpleNamespace(
+        id="msgbatch_1", processing_status="in_progress"
+    )
+    client.messages.batches.cancel = AsyncMock()
+    client.messages.create = AsyncMock(return_value=_fake_message(json.dumps(units)))
+    with patch("moxie.scrapers.tier3.llm.AsyncWebCrawler", _make_fake_crawler_ctx(UNITS_MARKDOWN)), \
+            patch("moxie.scrapers.tier3.llm.AsyncAnthropic", client_cls):
+        outcomes = asyncio.run(llm_module.scrape_many([building]))
+
+    client.messages.batches.cancel.assert_awaited_once_with("msgbatch_1")
+    assert client.messages.create.await_count == 1
+    assert [u["unit_number"] for u in outcomes[building.id]] == ["7A"]
+
+
+def test_scrape_many_returns_exceptions_per_building(monkeypatch):
+    """A building whose scrape raises gets the exception as its outcome."""
+    monkeypatch.delenv("ANTHROPIC_API_KEY", raising=False)
+
+    building = _make_building()
+    mock_ctx = _make_fake_crawler_ctx()
+    with patch("moxie.scrapers.tier3.llm.AsyncWebCrawler", mock_ctx):
+        outcomes = asyncio.run(llm_module.scrape_many([building]))
+
+    assert isinstance(outcomes[building.id], EnvironmentError)
+
+
+def test_scrape_many_reports_settled_buildings_before_the_batch(monkeypatch):
+    """on_outcome fires for an unextractable page before the batch is even submitted."""
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+    reported = []
+
+    async def fake_render(url, crawler, refresh=False):
+        markdown = UNITS_MARKDOWN if url.startswith("https://a.") else ""
+        return url, SimpleNamespace(markdown=markdown)
+
+    def on_outcome(building_id, outcome):
+        reported.append((building_id, outcome, client.messages.batches.create.await_count))
+
+    monkeypatch.setattr(llm_module, "_render_target", fake_render)
+    a = _make_building("https://a.example.com")
+    a.id = 1
+    b = _make_building("https://b.example.com")
+    b.id = 2
+    client_cls = _make_fake_batch_client({"1": "]"})
+    client = client_cls.return_value
+    with patch("moxie.scrapers.tier3.llm.AsyncWebCrawler", _make_fake_crawler_ctx()), \
+            patch("moxie.scrapers.tier3.llm.AsyncAnthropic", client_cls):
+        outcomes = asyncio.run(llm_module.scrape_many([a, b], on_outcome=on_outcome))
+
+    assert reported == [(2, [], 0), (1, [], 1)]
+    assert outcomes == {1: [], 2: []}
+
+
+def test_scrape_many_bounds_renders_in_flight(monkeypatch):
+    """No more than `concurrency` buildings are being rendered at once."""
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+    in_flight = peak = 0
+
+    async def fake_render(url, crawler, refresh=False):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0)
+        in_flight -= 1
+        return url, SimpleNamespace(markdown="")
+
+    monkeypatch.setattr(llm_module, "_render_target", fake_render)
+    buildings = []
+    for i in range(6):
+        b = _make_building(f"https://{i}.example.com")
+        b.id = i
+        buildings.append(b)
+    with patch("moxie.scrapers.tier3.llm.AsyncWebCrawler", _make_fake_crawler_ctx()):
+        outcomes = asyncio.run(llm_module.scrape_many(buildings, concurrency=2))
+
+    assert peak == 2
+    assert all(outcomes[b.id] == [] for b in buildings)
+
+
+# ---------------------------------------------------------------------------
+# Tests for _find_availability_link (Pass 1 probes)
+# ---------------------------------------------------------------------------
+
+def test_find_availability_link_prefers_first_subpage_hit(monkeypatch):
+    """When several probes hit, the earliest path in _EXPLICIT_SUBPAGES wins."""
+    async def fake_probe(crawler, url):
+        return url.endswith(("/floor-plans", "/apartments"))
+
+    monkeypatch.setattr(llm_module, "_probe_subpage", fake_probe)
+    mock_ctx = _make_fake_crawler_ctx()
+    link, _ = asyncio.run(
+        llm_module._find_availability_link("https://example.com/", mock_ctx.return_value)
+    )
+
+    assert link == "https://example.com/floor-plans"
+
+
+def test_find_availability_link_scores_homepage_links_when_no_probe_hits(monkeypatch):
+    """With no subpage hit, the homepage fetched alongside the probes is scored."""
+    async def fake_probe(crawler, url):
+        return False
+
+    monkeypatch.setattr(llm_module, "_probe_subpage", fake_probe)
+    mock_ctx = _make_fake_crawler_ctx()
+    mock_ctx.return_value.arun.return_value.links = {
+        "internal": [{"href": "/availability", "text": "Check Availability"}],
+    }
+    link, _ = asyncio.run(
+        llm_module._find_availability_link("https://example.com/", mock_ctx.return_value)
+    )
+
+    assert link == "https://example.com/availability"
+
+
+def test_find_availability_link_uses_dense_homepage_without_probing(monkeypatch):
+    """A homepage that already lists units is the target; subpage probes don't decide."""
+    async def fake_probe(crawler, url):
+        return True
+
+    monkeypatch.setattr(llm_module, "_probe_subpage", fake_probe)
+    listing = "".join(f"Unit {i} | 1 Bed | 700 sqft | $2,{i}00\n" for i in range(5))
+    crawler = _make_fake_crawler_ctx(listing).return_value
+
+    link, homepage = asyncio.run(
+        llm_module._find_availability_link("https://example.com/", crawler)
+    )
+
+    assert link == "https://example.com/"
+    assert homepage is crawler.arun.return_value
+
+
+MARKETING_HOMEPAGE = """\
+# Welcome to The Residences at River North
+Luxury apartment living in the heart of the community. Current residents, please
+log in to the resident portal to pay rent or submit a maintenance request.
+Schedule a tour today -- our leasing team is available seven days a week.
+Studio, one and two bedroom apartments with embedded smart-home features.
+Amenities: rooftop pool, fitness center, community lounge, bike storage.
+Pet friendly. Units feature in-unit laundry and floor-to-ceiling windows.
+Apartments starting at $1,850. Contact us to lease your new home!
+[Floor Plans](/floorplans) | [Availability](/availability) | [Residents](/residents)
+"""
+
+
+def test_find_availability_link_probes_past_marketing_homepage(monkeypatch):
+    """Marketing copy full of "community"/"current"/"please" is not a unit listing."""
+    async def fake_probe(crawler, url):
+        return url.endswith("/floorplans")
+
+    monkeypatch.setattr(llm_module, "_probe_subpage", fake_probe)
+    crawler = _make_fake_crawler_ctx(MARKETING_HOMEPAGE).return_value
+
+    link, _ = asyncio.run(
+        llm_module._find_availability_link("https://example.com/", crawler)
+    )
+
+    assert len(llm_module._CONTENT_RE.findall(MARKETING_HOMEPAGE)) >= 12
+    assert link == "https://example.com/floorplans"
+
+
+def test_render_target_reuses_homepage_render(monkeypatch):
+    """When Pass 1 settles on the homepage, it isn't rendered a second time."""
+    async def fake_probe(crawler, url):
+        return False
+
+    monkeypatch.setattr(llm_module, "_probe_subpage", fake_probe)
+    crawler = _make_fake_crawler_ctx().return_value
+
+    target_url, page = asyncio.run(llm_module._render_target("https://example.com", crawler))
+
+    assert target_url == "https://example.com"
+    assert crawler.arun.await_count == 1
+
+
+# ---------------------------------------------------------------------------
+# Tests for the Pass 1 (availability link) cache
+# ---------------------------------------------------------------------------
+
+def _count_link_lookups(monkeypatch, link):
+    """Replace _find_availability_link with a stub returning link (homepage rendered fine)."""
+    calls = []
+
+    async def fake_find(base_url, crawler):
+        calls.append(base_url)
+        return link, SimpleNamespace(success=True, markdown=UNITS_MARKDOWN, links={})
+
+    monkeypatch.setattr(llm_module, "_find_availability_link", fake_find)
+    return calls
+
+
+def test_warm_run_skips_link_discovery(monkeypatch):
+    """A second scrape of the same building reuses the cached availability subpage."""
+    calls = _count_link_lookups(monkeypatch, "https://example.com/floorplans")
+    crawler = _make_fake_crawler_ctx().return_value
+
+    first = asyncio.run(llm_module._render_target("https://example.com", crawler))
+    second = asyncio.run(llm_module._render_target("https://example.com", crawler))
+
+    assert calls == ["https://example.com"]
+    assert first[0] == second[0] == "https://example.com/floorplans"
+
+
+def test_no_subpage_result_is_cached(monkeypatch):
+    """A building where Pass 1 finds nothing is not re-probed; its own URL is rendered."""
+    calls = _count_link_lookups(monkeypatch, None)
+    crawler = _make_fake_crawler_ctx().return_value
+
+    asyncio.run(llm_module._render_target("https://example.com", crawler))
+    target_url, _ = asyncio.run(llm_module._render_target("https://example.com", crawler))
+
+    assert len(calls) == 1
+    assert target_url == "https://example.com"
+
+
+def test_failed_homepage_without_subpage_is_not_cached(monkeypatch):
+    """A homepage that failed to render with no probe hit is rediscovered next run."""
+    calls = []
+
+    async def fake_find(base_url, crawler):
+        calls.append(base_url)
+        return None, SimpleNamespace(success=False, markdown="", links={})
+
+    monkeypatch.setattr(llm_module, "_find_availability_link", fake_find)
+    crawler = _make_fake_crawler_ctx().return_value
+
+    asyncio.run(llm_module._render_target("https://example.com", crawler))
+    asyncio.run(llm_module._render_target("https://example.com", crawler))
+
+    assert len(calls) == 2
+
+
+def test_failed_render_of_cached_link_forces_rediscovery(monkeypatch):
+    """A cached subpage that no longer renders is dropped so the next run probes again."""
+    calls = _count_link_lookups(monkeypatch, "https://example.com/floorplans")
+    crawler = _make_fake_crawler_ctx().return_value
+
+    asyncio.run(llm_module._render_target("https://example.com", crawler))
+    crawler.arun.return_value.success = False
+    asyncio.run(llm_module._render_target("https://example.com", crawler))
+    asyncio.run(llm_module._render_target("https://example.com", crawler))
+
+    assert len(calls) == 2
+
+
+# ---------------------------------------------------------------------------
+# Tests for _focus_markdown (pre-LLM trimming)
+# ---------------------------------------------------------------------------
+
+def test_focus_markdown_leaves_short_pages_alone():
+    md = "# Nav\n\nUnit 101 | Studio | $1,500\n"
+    assert llm_module._focus_markdown(md) == md
+
+
+def test_focus_markdown_keeps_unit_region_and_drops_boilerplate():
+    nav = "".join(f"[Link {i}](https://example.com/page{i})\n" for i in range(400))
+    units = "".join(f"Unit {i} | 1 Bed | 700 sqft | ${2000 + i}\n" for i in range(30))
+    footer = "".join(f"Footer text line {i}\n" for i in range(400))
+
+    focused = llm_module._focus_markdown(nav + units + footer, window=2000)
+
+    assert units in focused
+    assert len(focused) < len(nav + units + footer) / 4
+
+
+def test_focus_markdown_without_keywords_is_unchanged():
+    md = "".join(f"plain line {i}\n" for i in range(500))
+    assert llm_module._focus_markdown(md, window=500) == md
+
+
+# ---------------------------------------------------------------------------
+# Tests for _http_precheck (plain-HTTP subpage fast path)
+# ---------------------------------------------------------------------------
+
+def _precheck(url):
+    async def run():
+        async with httpx.AsyncClient() as http:
+            return await llm_module._http_precheck(http, url)
+    return asyncio.run(run())
+
+
+def test_precheck_missing_page_is_a_miss(httpx_mock: HTTPXMock):
+    httpx_mock.add_response(url="https://example.com/floorplans", status_code=404)
+    assert _precheck("https://example.com/floorplans") is False
+
+
+def test_precheck_static_listing_is_a_hit(httpx_mock: HTTPXMock):
+    httpx_mock.add_response(
+        url="https://example.com/floorplans",
+        html=(
+            "<html><body><table>"
+            "<tr><td>Unit 204</td><td>Studio</td><td>480 sq ft</td><td>$1,500</td></tr>"
+            "</table></body></html>"
+        ),
+    )
+    assert _precheck("https://example.com/floorplans") is True
+
+
+def test_precheck_soft_404_with_footer_mentions_needs_browser(httpx_mock: HTTPXMock):
+    """A 200 "page not found" whose nav/footer mention rent and prices is not a hit."""
+    httpx_mock.add_response(
+        url="https://example.com/floorplans",
+        html=(
+            "<html><body><nav>Floor Plans | Amenities | Rent Now | Residents</nav>"
+            "<h1>Sorry, we couldn't find that page.</h1>"
+            "<footer>Luxury studio apartments from $1,500. Units going fast!</footer>"
+            "</body></html>"
+        ),
+    )
+    assert _precheck("https://example.com/floorplans") is None
+
+
+def test_precheck_script_only_page_needs_browser(httpx_mock: HTTPXMock):
+    httpx_mock.add_response(
+        url="https://example.com/floorplans",
+        html='<html><body><div id="root"></div><script>var unit = "$";</script></body></html>',
+    )
+    assert _precheck("https://example.com/floorplans") is None
+
+
+def test_precheck_blocked_page_needs_browser(httpx_mock: HTTPXMock):
+    httpx_mock.add_response(url="https://example.com/floorplans", status_code=403)
+    assert _precheck("https://example.com/floorplans") is None
@@ -0,0 +1,152 @@
+"""
+Tests for the SecureCafe availableunits.aspx scraper.
+
+All tests use static HTML fixtures — no real Crawl4AI or browser calls are made.
+"""
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import moxie.scrapers.tier2.securecafe as securecafe
+from moxie.scrapers.tier2.securecafe import (
+    _discover_securecafe_url,
+    _fetch_rendered_html,
+    _parse_available_units,
+)
+
+# ---------------------------------------------------------------------------
+# HTML fixtures
+# ---------------------------------------------------------------------------
+
+AVAILABLE_UNITS_HTML = """
+<div class="availableunits">
+  <table class="availableUnits">
+    <caption>Apartment Details and Selection for Floor Plan: A1 - 1 Bed / 1 Bath</caption>
+    <tr class="AvailUnitRow">
+      <td data-label="Apartment">#1435-406</td>
+      <td data-label="Sq.Ft.">1,050</td>
+      <td data-label="Rent">$2,450</td>
+      <td data-label="Date Available">3/15/2026</td>
+    </tr>
+  </table>
+  <table class="availableUnits">
+    <caption>Apartment Details and Selection for Floor Plan: S1 - Studio / 1 Bath</caption>
+    <tr class="AvailUnitRow">
+      <th>#512</th>
+      <td data-label="Sq.Ft.">480</td>
+      <td data-label="Rent">$1,650</td>
+      <td data-label="Date Available">Available</td>
+      <td><button class="UnitSelect"
+        onclick='ApplyNowClick("1","2","3","4/1/2026")'>Select</button></td>
+    </tr>
+  </table>
+  <table class="availableUnits">
+    <caption>Apartment Details and Selection for Floor Plan: B2 - 2 Bed / 2.5 Bath</caption>
+    <tr class="AvailUnitRow">
+      <td data-label="Apartment">#1401</td>
+      <td data-label="Sq.Ft.">1,320</td>
+      <td data-label="Rent">$3,900</td>
+      <td data-label="Date Available"></td>
+      <td><button class="UnitSelect"
+        onclick='ApplyNowClick("1","2","3","12/31/9999")'>Select</button></td>
+    </tr>
+  </table>
+</div>
+"""
+
+
+# ---------------------------------------------------------------------------
+# _discover_securecafe_url tests
+# ---------------------------------------------------------------------------
+
+class TestDiscoverSecureCafeUrl:
+    def test_extracts_base_path(self):
+        html = '<a href="https://8easthuron.securecafe.com/onlineleasing/8-east-huron/floorplans">Apply</a>'
+        assert _discover_securecafe_url(html) == (
+            "https://8easthuron.securecafe.com/onlineleasing/8-east-huron"
+        )
+
+    def test_no_link_returns_none(self):
+        assert _discover_securecafe_url("<a href='/contact'>Contact</a>") is None
+
+
+# ---------------------------------------------------------------------------
+# _parse_available_units tests
+# ---------------------------------------------------------------------------
+
+class TestParseAvailableUnits:
+    def test_no_container_returns_empty(self):
+        assert _parse_available_units("<div>nothing here</div>") == []
+
+    def test_all_rows_parsed(self):
+        units = _parse_available_units(AVAILABLE_UNITS_HTML)
+        assert [u["unit_number"] for u in units] == ["406", "512", "1401"]
+
+    def test_caption_bed_bath_and_floor_plan(self):
+        unit = _parse_available_units(AVAILABLE_UNITS_HTML)[0]
+        assert unit["floor_plan_name"] == "A1"
+        assert unit["bed_type"] == "1BR"
+        assert unit["baths"] == "1"
+
+    def test_caption_studio(self):
+        unit = _parse_available_units(AVAILABLE_UNITS_HTML)[1]
+        assert unit["bed_type"] == "Studio"
+        assert unit["floor_plan_name"] == "S1"
+
+    def test_caption_fractional_baths(self):
+        unit = _parse_available_units(AVAILABLE_UNITS_HTML)[2]
+        assert unit["bed_type"] == "2BR"
+        assert unit["baths"] == "2.5"
+
+    def test_sqft_and_rent(self):
+        unit = _parse_available_units(AVAILABLE_UNITS_HTML)[0]
+        assert unit["sqft"] == 1050
+        assert unit["rent"] == "$2,450"
+
+    def test_date_cell_used_when_present(self):
+        unit = _parse_available_units(AVAILABLE_UNITS_HTML)[0]
+        assert unit["availability_date"] == "3/15/2026"
+
+    def test_apply_now_fallback_date(self):
+        unit = _parse_available_units(AVAILABLE_UNITS_HTML)[1]
+        assert unit["availability_date"] == "4/1/2026"
+
+    def test_apply_now_sentinel_means_available_now(self):
+        unit = _parse_available_units(AVAILABLE_UNITS_HTML)[2]
+        assert unit["availability_date"] == "Available Now"
+
+
+# ---------------------------------------------------------------------------
+# _fetch_rendered_html memo tests
+# ---------------------------------------------------------------------------
+
+class TestFetchRenderedHtmlMemo:
+    def _crawler(self, html):
+        crawler = MagicMock()
+        crawler.arun = AsyncMock(return_value=MagicMock(html=html))
+        return crawler
+
+    def test_repeat_url_rendered_once(self, monkeypatch):
+        monkeypatch.setattr(securecafe, "_render_memo", {})
+        crawler = self._crawler("<html>units</html>")
+        url = "https://x.securecafe.com/onlineleasing/x/availableunits.aspx"
+        first = asyncio.run(_fetch_rendered_html(crawler, url))
+        second = asyncio.run(_fetch_rendered_html(crawler, url))
+        assert first == second == "<html>units</html>"
+        assert crawler.arun.await_count == 1
+
+    def test_expired_entry_rerenders(self, monkeypatch):
+        monkeypatch.setattr(securecafe, "_render_memo", {})
+        monkeypatch.setattr(securecafe, "_RENDER_MEMO_TTL", 0.0)
+        crawler = self._crawler("<html>units</html>")
+        url = "https://x.securecafe.com/onlineleasing/x/availableunits.aspx"
+        asyncio.run(_fetch_rendered_html(crawler, url))
+        asyncio.run(_fetch_rendered_html(crawler, url))
+        assert crawler.arun.await_count == 2
+
+    def test_empty_render_not_memoized(self, monkeypatch):
+        monkeypatch.setattr(securecafe, "_render_memo", {})
+        crawler = self._crawler("")
+        url = "https://x.securecafe.com/onlineleasing/x/availableunits.aspx"
+        asyncio.run(_fetch_rendered_html(crawler, url))
+        asyncio.run(_fetch_rendered_html(crawler, url))
+        assert crawler.arun.await_count == 2
@@ -0,0 +1,107 @@
+"""
+Tests for the SightMap scraper's embed-ID discovery.
+
+Uses pytest-httpx to mock the streamed candidate-page responses.
+"""
+import asyncio
+
+import httpx
+import pytest
+from pytest_httpx import IteratorStream
+
+from moxie.scrapers.tier2 import sightmap
+from moxie.scrapers.tier2.sightmap import (
+    SightMapScraperError,
+    _extract_embed_id_async,
+    _fetch_embed_id,
+)
+
+BUILDING_URL = "https://www.example-apts.com/"
+PAGE_URL = "https://www.example-apts.com/floorplans"
+
+
+def _fetch(url: str = PAGE_URL) -> str | None:
+    async def _run():
+        async with httpx.AsyncClient() as client:
+            return await _fetch_embed_id(client, url)
+    return asyncio.run(_run())
+
+
+# ---------------------------------------------------------------------------
+# _fetch_embed_id
+# ---------------------------------------------------------------------------
+
+def test_fetch_embed_id_matches_id_split_across_chunks(httpx_mock):
+    """An embed URL broken across two chunks is still found."""
+    httpx_mock.add_response(url=PAGE_URL, stream=IteratorStream([
+        b'<html><body><iframe src="https://sightmap.com/em',
+        b'bed/abc123xyz" width="100%"></iframe></body></html>',
+    ]))
+
+    assert _fetch() == "abc123xyz"
+
+
+def test_fetch_embed_id_waits_for_the_next_chunk_before_trusting_a_match(httpx_mock, monkeypatch):
+    """A match touching the chunk boundary is not returned until the ID is complete."""
+    monkeypatch.setattr(sightmap, "_STREAM_OVERLAP", 64)
+    httpx_mock.add_response(url=PAGE_URL, stream=IteratorStream([
+        b'<iframe src="https://sightmap.com/embed/abc',
+        b'123xyz"></iframe>',
+    ]))
+
+    assert _fetch() == "abc123xyz"
+
+
+def test_fetch_embed_id_accepts_id_at_end_of_body(httpx_mock):
+    """An ID that runs to the very end of the body is complete once the stream ends."""
+    httpx_mock.add_response(url=PAGE_URL, stream=IteratorStream([
+        b"<html>see our map: ",
+        b"https://sightmap.com/embed/abc123xyz",
+    ]))
+
+    assert _fetch() == "abc123xyz"
+
+
+def test_fetch_embed_id_non_200_returns_none(httpx_mock):
+    """A page that does not load is treated as having no embed."""
+    httpx_mock.add_response(url=PAGE_URL, status_code=404, text="sightmap.com/embed/abc123xyz ")
+
+    assert _fetch() is None
+
+
+def test_fetch_embed_id_no_match_returns_none(httpx_mock):
+    """Only the loader script, no embed ID -> None."""
+    httpx_mock.add_response(
+        url=PAGE_URL,
+        text='<script src="https://sightmap.com/embed/api.js"></script>',
+    )
+
+    assert _fetch() is None
+
+
+# ---------------------------------------------------------------------------
+# _extract_embed_id_async
+# ---------------------------------------------------------------------------
+
+@pytest.mark.httpx_mock(assert_all_responses_were_requested=False)
+def test_extract_embed_id_prefers_building_url_over_subpages(httpx_mock):
+    """When several candidates embed a map, the building URL's ID wins even if it loads last."""
+    async def slow_root(request):
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, text='<iframe src="https://sightmap.com/embed/root111"></iframe>')
+
+    httpx_mock.add_callback(slow_root, url=BUILDING_URL)
+    httpx_mock.add_response(
+        url=PAGE_URL, text='<iframe src="https://sightmap.com/embed/sub222"></iframe>'
+    )
+    httpx_mock.add_response(text="<html></html>", is_reusable=True, is_optional=True)
+
+    assert asyncio.run(_extract_embed_id_async(BUILDING_URL)) == "root111"
+
+
+def test_extract_embed_id_raises_when_no_candidate_matches(httpx_mock):
+    """Every candidate page loads but none embeds a map -> SightMapScraperError."""
+    httpx_mock.add_response(text="<html>no map here</html>", is_reusable=True)
+
+    with pytest.raises(SightMapScraperError, match="No SightMap embed found"):
+        asyncio.run(_extract_embed_id_async(BUILDING_URL))
@@ -5,13 +5,15 @@ All external calls (gspread, service account) are mocked. DB tests use an
 in-memory SQLite session so no external state is required.
 """
 
+from datetime import datetime, timezone
+
 import pytest
 from unittest.mock import patch, MagicMock
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
 from moxie.config import GOOGLE_SHEETS_TAB_NAME
-from moxie.db.models import Base, Building
+from moxie.db.models import Base, Building, ScrapeRun, Unit
 from moxie.sync.sheets import sheets_sync, _parse_rows
 
 
@@ -182,6 +184,19 @@ class TestNewBuildings:
         assert building.last_scrape_status == "never"
 
 
+    def test_repeated_sheet_url_added_once(self, db):
+        raw = _raw(
+            _make_row(name="First", url="https://example.com/a"),
+            _make_row(name="Second", url="https://example.com/a"),
+        )
+        with patch("moxie.sync.sheets.gspread.service_account", return_value=_mock_gc(raw)):
+            result = sheets_sync(db)
+        assert result["added"] == 1
+        assert result["updated"] == 1
+        buildings = db.query(Building).all()
+        assert len(buildings) == 1
+        assert buildings[0].name == "Second"
+
 class TestExistingBuildingsUpdated:
     def test_existing_building_updated_not_duplicated(self, db):
         db.add(Building(name="Old Name", url="https://example.com/b", last_scrape_status="never"))
@@ -238,6 +253,22 @@ class TestMissingBuildingsDeleted:
         assert result["deleted"] == 3
         assert result["added"] == 1
 
+    def test_deleted_building_units_and_runs_removed(self, db):
+        gone = Building(name="Gone", url="https://example.com/gone", last_scrape_status="never")
+        now = datetime.now(timezone.utc)
+        gone.units.append(Unit(unit_number="101", bed_type="Studio", rent_cents=150000,
+                               availability_date="2026-03-01", scrape_run_at=now))
+        gone.scrape_runs.append(ScrapeRun(run_at=now, status="success", unit_count=1))
+        db.add(gone)
+        db.commit()
+
+        raw = _raw(_make_row(url="https://example.com/present"))
+        with patch("moxie.sync.sheets.gspread.service_account", return_value=_mock_gc(raw)):
+            sheets_sync(db)
+
+        assert db.query(Unit).count() == 0
+        assert db.query(ScrapeRun).count() == 0
+
 
 class TestEmptyAndNoURLGuard:
     def test_empty_raw_raises_value_error(self, db):
@@ -310,6 +341,16 @@ class TestTabName:
         mock_sh.worksheet.assert_called_once_with(GOOGLE_SHEETS_TAB_NAME)
 
 
+class TestSpreadsheetClient:
+    def test_client_authenticated_once_per_process(self, db):
+        gc = _mock_gc(_raw(_make_row()))
+        with patch("moxie.sync.sheets.gspread.service_account", return_value=gc) as auth:
+            sheets_sync(db)
+            sheets_sync(db)
+
+        auth.assert_called_once()
+
+
 # ---------------------------------------------------------------------------
 # Test platform detection integration in sheets_sync
 # ---------------------------------------------------------------------------